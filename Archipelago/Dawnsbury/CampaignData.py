@@ -1,9 +1,24 @@
-from typing import List, Tuple
-from .Options import DawnsburyOptions
+from __future__ import annotations
+from types import MappingProxyType
+from typing import List, Tuple, TYPE_CHECKING
+
+from .Profiling import profiled
+
+# Only import the options for type hints, so that the build script can load this module without archipelago
+if TYPE_CHECKING:
+    from .Options import DawnsburyOptions
 
 DEFAULT_CHARACTERS = ["Annacoesta", "Scarlet", "Tok'dar", "Saffi"]
 
+LOOT_CATEGORIES: Tuple[str, ...] = ("potion", "scroll", "weapon", "tool")
+
 class Campaign():
+    # Campaigns are shared by every slot (and can have big loot tables), so keep them compact and read only
+    __slots__ = ("name", "characters", "num_encounters", "start_level", "end_level",
+                 "start_atk_bonus", "end_atk_bonus", "start_armor_bonus", "end_armor_bonus",
+                 "start_skill_bonus", "end_skill_bonus", "potion_loot", "scroll_loot", "weapon_loot", "tool_loot",
+                 "levels", "per_character_drop_counts", "loot_by_category", "loot_counts", "loot_index", "max_drops", "chapters")
+
     def __init__(self, name: str, encounter_count: int, start_level: int, end_level: int,
                  start_atk_bonus: int, end_atk_bonus: int,
                  start_armor_bonus: int, end_armor_bonus: int,
@@ -12,7 +27,7 @@ class Campaign():
                  weapon_loot: List[Tuple[str, int]], tool_loot: List[Tuple[str, int]],
                  characters: str = DEFAULT_CHARACTERS):
         self.name = name
-        self.characters = characters # This probably cant ever not be the default bc of how items are defined, but just in case its here
+        self.characters = tuple(characters or DEFAULT_CHARACTERS) # This probably cant ever not be the default bc of how items are defined, but just in case its here (empty means default)
         self.num_encounters = encounter_count
         self.start_level = start_level
         self.end_level = end_level
@@ -32,12 +47,47 @@ class Campaign():
         # Armor bonuses not in dd, will add if i do dlc later
 
         # Loot awarded during the adventure, sorted by type. Includes the amount of each item.
-        self.potion_loot = potion_loot
-        self.scroll_loot = scroll_loot
-        self.weapon_loot = weapon_loot
-        self.tool_loot = tool_loot
+        self.potion_loot = tuple(potion_loot)
+        self.scroll_loot = tuple(scroll_loot)
+        self.weapon_loot = tuple(weapon_loot)
+        self.tool_loot = tuple(tool_loot)
         # possibly add a misc category later if needed (eg aeon stones)
 
+        ### Precomputed Aggregates ###
+        # Every character level the campaign is played at
+        self.levels = range(start_level, end_level + 1)
+
+        # The encounters (numbered 1-n) played at each level, assuming they are spread evenly between levels
+        self.chapters = tuple((level, range(encounter_count * i // len(self.levels) + 1, encounter_count * (i + 1) // len(self.levels) + 1))
+                              for i, level in enumerate(self.levels))
+
+        # How many of each per character drop (per character) the campaign awards
+        self.per_character_drop_counts = (
+            ("Level Up", end_level - start_level),
+            ("Weapon Upgrade", end_atk_bonus - start_atk_bonus),
+            ("Armor Upgrade", end_armor_bonus - start_armor_bonus),
+            ("Skill Upgrade", end_skill_bonus - start_skill_bonus),
+        )
+
+        # Loot indexes: entries by category, total amount of loot by category, and (category, amount) by item name
+        self.loot_by_category = MappingProxyType(dict(zip(LOOT_CATEGORIES, (self.potion_loot, self.scroll_loot, self.weapon_loot, self.tool_loot))))
+        self.loot_counts = MappingProxyType({category: sum(count for _, count in loot) for category, loot in self.loot_by_category.items()})
+        loot_index = {}
+        for category, loot in self.loot_by_category.items():
+            for item, count in loot:
+                loot_index[item] = (category, loot_index.get(item, (category, 0))[1] + count)
+        self.loot_index = MappingProxyType(loot_index)
+
+        # Assuming the most generous settings, what is the maximum possible number of drops this campaign can yield
+        self.max_drops = 4 * (end_atk_bonus - start_atk_bonus + end_level - start_level) + \
+            sum(len(loot) for loot in self.loot_by_category.values())
+
+    def __setattr__(self, name: str, value):
+        if hasattr(self, name):
+            raise AttributeError(f"Campaign '{self.name}' is read only (tried to change {name})")
+        super().__setattr__(name, value)
+
+    @profiled
     def get_all_campaign_drops(self, settings: DawnsburyOptions) -> tuple[list[str], list[str]]:
         '''Using the provided settings, filter and return a complete list of all items to be dropped in the campaign.
            Returns two lists: the first is items which need to be duplicated for each player, and the second is items that are as they are'''
@@ -46,21 +96,8 @@ class Campaign():
 
     def get_per_character_drops(self, settings: DawnsburyOptions) -> List[str]:
         '''Return a list of drops which are per-character (eg Annocesta's Level Up)'''
-        drops = []
-        
-        # Add the requisite number of level ups to the list
-        drops += ["Level Up"] * (self.end_level - self.start_level)
-
-        # Add Weapon rune increases
-        drops += ["Weapon Upgrade"] * (self.end_atk_bonus - self.start_atk_bonus)
-
-        # Add Armor rune increases
-        drops += ["Armor Upgrade"] * (self.end_armor_bonus - self.start_armor_bonus)
-        
-        # Add Skill item increases
-        drops += ["Skill Upgrade"] * (self.end_skill_bonus - self.start_skill_bonus)
-        
-        return drops
+        # Level ups, then weapon rune, armor rune, and skill item increases
+        return [drop for drop, count in self.per_character_drop_counts for _ in range(count)]
 
     def get_singe_drops(self, settings: DawnsburyOptions) -> List[str]:
         '''Return a list of standard item drops (Eg. +1 Longsword)'''
@@ -68,16 +105,20 @@ class Campaign():
     
     def get_maximum_amount_of_drops(self) -> int:
         '''Assuming the most generous settings, what is the maximum possible number of drops this campaign can yield'''
-        return 4 * (self.end_atk_bonus - self.start_atk_bonus + self.end_level - self.start_level) +\
-            len(self.potion_loot) + len(self.scroll_loot) + len(self.weapon_loot) + len(self.tool_loot)
+        return self.max_drops
 
+@profiled
 def get_chosen_campaign(options: DawnsburyOptions) -> Campaign:
     '''Determine what campaign(s) are selected in the options.'''
     return All_Campaigns[options.campaign.value]
 
+@profiled
 def make_campaign_metadata(options: DawnsburyOptions) -> dict[str, object]:
     '''Package the campaign metadata that the mod needs to run.'''
-    campaign = get_chosen_campaign(options)
+    return get_campaign_metadata(get_chosen_campaign(options))
+
+def get_campaign_metadata(campaign: Campaign) -> dict[str, object]:
+    '''Get the metadata that the mod needs to run a campaign.'''
     return {
         'start_level': campaign.start_level,
         'end_level': campaign.end_level,
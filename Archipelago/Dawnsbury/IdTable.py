@@ -0,0 +1,100 @@
+import hashlib
+import json
+import pkgutil
+from itertools import product
+from typing import List, Optional, Tuple
+
+from .CampaignData import All_Campaigns, DEFAULT_CHARACTERS, get_campaign_metadata
+from .Profiling import profiled
+
+# Note: Nothing in here can depend on archipelago, since the build script loads this module by itself to write the id table.
+
+# All id's need to be unique across all games, thus, we define an starting offset value
+# Note: they seem to have removed the uniqueness requirement in more recent versions.
+BASE_OFFSET = 0x02400
+GAME_COMPLETE = 'All Encounters Clear!'
+
+# Lists of all items that archipelago can award.
+singleton_items: List[str] = [
+    GAME_COMPLETE
+]
+per_character_items: List[str] = [
+    "Level Up",
+    "Weapon Upgrade",
+    "Armor Upgrade",
+    "Skill Upgrade",
+]
+
+def expand_per_character_items() -> List[str]:
+   return [make_character_item_name(item, name) for item, name in product(per_character_items, DEFAULT_CHARACTERS)]
+
+def get_all_item_names() -> List[str]:
+    return expand_per_character_items() + singleton_items
+
+def make_character_item_name(item: str, character: str) -> str:
+    '''Define a common design for a character specific item name'''
+    return item + ' (' + character + ')'
+
+def decode_item_id(code: int) -> Tuple[str, Optional[str]]:
+    '''Get the (item type, character) of an item id, without parsing its name (character is None for singleton items).
+       Per character items are numbered in item type major order, so this is just a divmod.'''
+    index = code - BASE_OFFSET
+    per_character_count = len(per_character_items) * len(DEFAULT_CHARACTERS)
+    if 0 <= index < per_character_count:
+        item, character = divmod(index, len(DEFAULT_CHARACTERS))
+        return per_character_items[item], DEFAULT_CHARACTERS[character]
+    if per_character_count <= index < per_character_count + len(singleton_items):
+        return singleton_items[index - per_character_count], None
+    raise KeyError(f"{code} is not a Dawnsbury Days item id.")
+
+def get_encounter_name(number: int) -> str:
+    '''Standardized encounter name generator'''
+    return 'Battle #%s' % number
+
+def get_all_location_names() -> List[str]:
+    '''Get the name of every possible location in the game'''
+    # We need a unique location for every encounter in a run.
+    # Fortunatley, we only do one campaign per run so we only need enough to cover the biggest campaign 
+    max_encounters = max(campaign.num_encounters for campaign in All_Campaigns)
+    return [get_encounter_name(i+1) for i in range(max_encounters)]
+
+# The id table is a compact file with every item/location name (their id is BASE_OFFSET + their index) and the campaign metadata.
+# Bump the version whenever the layout of the file changes.
+ID_TABLE_VERSION = 1
+ID_TABLE_FILE = 'id_table.json'
+
+@profiled
+def make_id_table() -> dict:
+    '''Build the id table from scratch'''
+    table = {
+        'version': ID_TABLE_VERSION,
+        'base_offset': BASE_OFFSET,
+        'items': get_all_item_names(),
+        'locations': get_all_location_names(),
+        'campaigns': [get_campaign_metadata(campaign) for campaign in All_Campaigns],
+    }
+    table['checksum'] = get_id_table_checksum(table)
+    return table
+
+def get_id_table_checksum(table: dict) -> str:
+    '''Checksum the ids in the table so that the client can cheaply check that it agrees with them'''
+    ids = json.dumps([table['base_offset'], table['items'], table['locations']], separators=(',', ':'))
+    return hashlib.sha256(ids.encode('utf-8')).hexdigest()[:16]
+
+def serialize_id_table() -> str:
+    '''Make the compact json id table file contents (used by the build script)'''
+    return json.dumps(make_id_table(), separators=(',', ':'))
+
+_dd_id_table = {}
+@profiled
+def get_id_table() -> dict:
+    '''Load the id table packaged by the build script, or make it ourselves if we are running from source'''
+    global _dd_id_table
+    if not _dd_id_table:
+        try:
+            data = pkgutil.get_data(__package__, ID_TABLE_FILE)
+            table = json.loads(data) if data else {}
+        except (OSError, ValueError):
+            table = {}
+        _dd_id_table = table if table.get('version') == ID_TABLE_VERSION else make_id_table()
+    return _dd_id_table
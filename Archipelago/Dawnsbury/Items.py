@@ -1,15 +1,14 @@
 from BaseClasses import Item, ItemClassification
-from itertools import product
-from typing import Dict, List
-import random
+from collections import OrderedDict
+from typing import Collection, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+from random import Random
+from types import MappingProxyType
 
 from .CampaignData import get_chosen_campaign, DEFAULT_CHARACTERS
+from .IdTable import BASE_OFFSET, GAME_COMPLETE, singleton_items, per_character_items, expand_per_character_items, \
+    get_all_item_names, make_character_item_name, get_id_table
 from .Options import DawnsburyOptions
-
-# All id's need to be unique across all games, thus, we define an starting offset value
-# Note: they seem to have removed the uniqueness requirement in more recent versions.
-BASE_OFFSET = 0x02400
-GAME_COMPLETE = 'All Encounters Clear!'
+from .Profiling import profiled
 
 class DawnsburyItem(Item):
     game = "Dawnsbury Days"
@@ -22,27 +21,6 @@ class DawnsburyItem(Item):
             player
         )
 
-# Lists of all items that archipelago can award.
-singleton_items: List[str] = [
-    GAME_COMPLETE
-]
-per_character_items: List[str] = [
-    "Level Up",
-    "Weapon Upgrade",
-    "Armor Upgrade",
-    "Skill Upgrade",
-]
-
-def expand_per_character_items() -> List[str]:
-   return [make_character_item_name(item, name) for item, name in product(per_character_items, DEFAULT_CHARACTERS)]
-
-def get_all_item_names() -> List[str]:
-    return expand_per_character_items() + singleton_items
-
-def make_character_item_name(item: str, character: str) -> str:
-    '''Define a common design for a character specific item name'''
-    return item + ' (' + character + ')'
-
 # Kinda all of our items are progression items rn. Will change if we include random reward loot.
 progression_items: List[str] = get_all_item_names()
 
@@ -55,42 +33,138 @@ def get_cached_item_directory() -> Dict[str, int]:
     '''Caching wrapper function so we dont have to constantly regenerate this directory'''
     global _dd_item_cache
     if not _dd_item_cache:
-        _dd_item_cache = {name: (id+BASE_OFFSET) for id, name in enumerate(get_all_item_names())}
+        table = get_id_table()
+        _dd_item_cache = {name: (id+table['base_offset']) for id, name in enumerate(table['items'])}
     return _dd_item_cache
 
-def create_item(name: str, player: int) -> DawnsburyItem:
+_dd_item_table = {}
+def get_item_table() -> Dict[str, Tuple[int, bool]]:
+    '''Get a cached (name -> (code, is progression)) table, so making an item is a single dict lookup'''
+    global _dd_item_table
+    if not _dd_item_table:
+        progression = set(progression_items)
+        _dd_item_table = {name: (id, name in progression) for name, id in get_cached_item_directory().items()}
+    return _dd_item_table
+
+_dd_character_item_cache = {}
+def get_character_item_names(item: str) -> List[str]:
+    '''Get the (cached) list of character specific names for a per character item type'''
+    if item not in _dd_character_item_cache:
+        _dd_character_item_cache[item] = [make_character_item_name(item, character) for character in DEFAULT_CHARACTERS]
+    return _dd_character_item_cache[item]
+
+# With level gating on, only the level ups unlock anything, so the other upgrades are only useful.
+# Keeping them out of the progression fill leaves the early chapters' locations for the level ups that those chapters need.
+level_gating_progression_items = frozenset(get_character_item_names("Level Up") + singleton_items)
+
+def get_progression_items(options: DawnsburyOptions) -> Optional[Collection[str]]:
+    '''Get the items which are progression with these options (None if they are all progression as usual)'''
+    return level_gating_progression_items if options.level_gating else None
+
+@profiled
+def make_item_name_groups() -> Dict[str, frozenset]:
+    '''Group the items by character (ie "Saffi") and by upgrade type (ie "Level Up"), for hints and trackers'''
+    groups = {item: frozenset(get_character_item_names(item)) for item in per_character_items}
+    for character in DEFAULT_CHARACTERS:
+        groups[character] = frozenset(make_character_item_name(item, character) for item in per_character_items)
+    return groups
+
+class PoolTemplate(NamedTuple):
+    '''Immutable item pool shared by every slot which uses the same pool affecting options'''
+    names: Tuple[str, ...] # Every item in the pool, before trimming
+    extra: int # How many items need to be trimmed for the pool to fit the campaign
+    buckets: Mapping[str, Tuple[int, ...]] # Indexes of the items of each per character item type, for trimming
+
+def get_pool_template_key(options: DawnsburyOptions) -> Tuple[int, int, int]:
+    '''Get the values of the options which change the contents of the item pool'''
+    return options.campaign.value, options.potency_runes.value, options.loot_randomizer.value
+
+@profiled
+def make_pool_template(options: DawnsburyOptions) -> PoolTemplate:
+    '''Build the names of every item in the campaign's pool, and figure out how much it needs to be trimmed'''
+    campaign = get_chosen_campaign(options)
+    per_character, single = campaign.get_all_campaign_drops(options)
+    names = list(single)
+    buckets = {}
+    for item_name in per_character:
+        buckets.setdefault(item_name, []).extend(range(len(names), len(names) + len(DEFAULT_CHARACTERS)))
+        names += get_character_item_names(item_name)
+
+    # "You win" item is not in the random list, so we must add one here
+    extra = max(0, len(names) + 1 - campaign.num_encounters)
+    if extra:
+        print(f"Warning: found {extra} extra items in {campaign.name}, trimming drop list.")
+
+    return PoolTemplate(tuple(names), extra, MappingProxyType({item: tuple(indexes) for item, indexes in buckets.items()}))
+
+# Templates are shared between slots (and generations, in long running processes), so keep a bounded LRU cache of them
+POOL_TEMPLATE_CACHE_SIZE = 32
+pool_template_cache_stats = {'hits': 0, 'misses': 0}
+_dd_pool_templates: OrderedDict = OrderedDict()
+@profiled
+def get_pool_template(options: DawnsburyOptions) -> PoolTemplate:
+    '''Get the (cached) item pool template for a set of options'''
+    key = get_pool_template_key(options)
+    if key in _dd_pool_templates:
+        pool_template_cache_stats['hits'] += 1
+        _dd_pool_templates.move_to_end(key)
+        return _dd_pool_templates[key]
+
+    pool_template_cache_stats['misses'] += 1
+    template = _dd_pool_templates[key] = make_pool_template(options)
+    if len(_dd_pool_templates) > POOL_TEMPLATE_CACHE_SIZE:
+        _dd_pool_templates.popitem(last=False)
+    return template
+
+@profiled
+def create_item(name: str, player: int, progression_items: Collection[str] = None) -> DawnsburyItem:
     '''Create a single item upon request by the server'''
-    if name in get_cached_item_directory():
-        return DawnsburyItem(name, get_cached_item_directory()[name], name in progression_items, player)
-    else: # Not a real item, make it an "event" item instead
-         return DawnsburyItem(name, -1, True, player)
+    # If its not a real item, make it an "event" item instead
+    code, progression = get_item_table().get(name, (-1, True))
+    if progression_items is not None and code >= 0:
+        progression = name in progression_items
+    return DawnsburyItem(name, code, progression, player)
+
+@profiled
+def create_items_from_names(names: Iterable[str], player: int, progression_items: Collection[str] = None) -> List[DawnsburyItem]:
+    '''Create an item for each name in the list (names must be real items)'''
+    table = get_item_table()
+    if progression_items is None:
+        return [DawnsburyItem(name, *table[name], player) for name in names]
+    return [DawnsburyItem(name, table[name][0], name in progression_items, player) for name in names]
 
 def create_items_for_each_character(item_name: str, characters: List[str], player: int) -> List[DawnsburyItem]:
     '''Create a set of dawnsbury items of the input type for each character in the provided list'''
     return [create_item(make_character_item_name(item_name, character), player) for character in characters]
 
-def create_items(player: int, options: DawnsburyOptions) -> List[DawnsburyItem]:
-    '''Preare a list of items to include in the randomizer based on the selected customization options'''
-    per_character, single = get_chosen_campaign(options).get_all_campaign_drops(options)
-    
-    all_drops = [create_item(item, player) for item in single]
-    for item_name in per_character:
-        all_drops += create_items_for_each_character(item_name, DEFAULT_CHARACTERS, player)
-
-    return trim_item_list(all_drops, options)
-
-def trim_item_list(items: List[DawnsburyItem], options: DawnsburyOptions):
-    '''If the item list is too long (such as in the profane barrier), log it and reduce the list size'''
-    encounters = get_chosen_campaign(options).num_encounters
-    if encounters < len(items) + 1: # "You win" item is not in the random list, so we must add one here
-        extra = len(items) + 1 - encounters
-        print(f"Warning: found {extra} extra items, trimming drop list.")
-        
-        # Remove X randomly selected character drops from the lowest priority (last defined) bucket
-        cantidates = [make_character_item_name(item, name) for item, name in product([per_character_items[-1]], DEFAULT_CHARACTERS)]
-        to_remove = random.sample(cantidates, extra)
-        print(f"Removing the following items: {to_remove}.")
-        return [x for x in items if x.name not in to_remove]
-    return items
-        
-        
+@profiled
+def create_items(player: int, template: PoolTemplate, rng: Random, progression_items: Collection[str] = None) -> List[DawnsburyItem]:
+    '''Preare a list of items to include in the randomizer from the pool template for the selected customization options'''
+    return create_items_from_names(trim_item_list(template, rng), player, progression_items)
+
+# Order in which per character items are trimmed from an oversized pool (lowest priority, last defined, first)
+TRIM_PRIORITY: Tuple[str, ...] = tuple(reversed(per_character_items))
+
+@profiled
+def trim_item_list(template: PoolTemplate, rng: Random, priority: Sequence[str] = TRIM_PRIORITY) -> Sequence[str]:
+    '''If the item list is too long (such as in the profane barrier), reduce the list size.
+       Randomly selected character drops are removed from each bucket in priority order until the pool fits.'''
+    if not template.extra:
+        return template.names
+
+    trimmable = sum(len(template.buckets.get(item, ())) for item in priority)
+    if template.extra > trimmable:
+        raise ValueError(f"Can't trim {template.extra} items from the item pool, it only has {trimmable} items which can be trimmed.")
+
+    to_remove = []
+    for item in priority:
+        bucket = template.buckets.get(item, ())
+        to_remove += rng.sample(bucket, min(template.extra - len(to_remove), len(bucket)))
+        if len(to_remove) == template.extra:
+            break
+    print(f"Removing the following items: {[template.names[i] for i in to_remove]}.")
+
+    keep = [True] * len(template.names)
+    for i in to_remove:
+        keep[i] = False
+    return [name for name, kept in zip(template.names, keep) if kept]
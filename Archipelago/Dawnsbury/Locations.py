@@ -1,8 +1,9 @@
-from typing import Dict, List
+from typing import Dict, Iterable, List
 from BaseClasses import Location, Region
-from .CampaignData import Campaign, All_Campaigns, get_chosen_campaign
-from .Items import BASE_OFFSET
+from .CampaignData import All_Campaigns, Campaign, get_chosen_campaign
+from .IdTable import get_encounter_name, get_id_table
 from .Options import DawnsburyOptions
+from .Profiling import profiled
 
 class DawnsburyLocation(Location):
     game: str = "Dawnsbury Days"
@@ -12,36 +13,67 @@ class DawnsburyLocation(Location):
 
 # TODO: This does not need to be static, instead we can make it after determining the game's location list
 # Start w game clear location, then increment for each encounter drop
+@profiled
 def make_location_cache() -> Dict[str, int]:
     '''Get the ap code for all possible locations in the game'''
+    table = get_id_table()
+    return {name: i + table['base_offset'] for i, name in enumerate(table['locations'])}
 
-    # We need a unique location for every encounter in a run.
-    # Fortunatley, we only do one campaign per run so we only need enough to cover the biggest campaign 
-    max_encounters = 0
-    for campaign in All_Campaigns:
-        if campaign.num_encounters > max_encounters:
-            max_encounters = campaign.num_encounters
-    
-    # Now make a list of Battle #3 type names for each encounter to save as the resolver cache
-    result = {}
-    for i in range(0,max_encounters):
-        result[get_encounter_name(i+1)] = i + BASE_OFFSET
-    return result
-
-def get_encounter_name(number: int) -> str:
-    '''Standardized encounter name generator'''
-    return 'Battle #%s' % number
-
-def get_locations(campaign: Campaign, region: Region, player: int) -> List[DawnsburyLocation]:
+@profiled
+def make_reward_table(locations: Iterable[Location]) -> List[int]:
+    '''Make a flat table of what every encounter location holds, ordered by encounter number.
+       Each encounter gets 3 entries: item id (0 for events), receiving player, and item classification flags'''
+    base_offset = get_id_table()['base_offset']
+    located = [location for location in locations if location.address is not None]
+    table = [0] * (3 * len(located))
+    for location in located:
+        i = 3 * (location.address - base_offset)
+        table[i:i+3] = location.item.code or 0, location.item.player, int(location.item.classification)
+    return table
+
+def get_chapter_name(campaign: Campaign, level: int) -> str:
+    '''Standardized name for the region containing a campaign's encounters of a specific level (when level gating is on)'''
+    return f'{campaign.name} (Level {level})'
+
+def get_chapter_group_name(campaign: Campaign, chapter: int) -> str:
+    '''Standardized name for the location group of a campaign's nth chapter (numbered from 1)'''
+    return f'{campaign.name} Chapter {chapter}'
+
+@profiled
+def make_location_name_groups() -> Dict[str, frozenset]:
+    '''Group the encounters of every campaign by chapter, for hints and trackers.
+       Chapters are the campaign's encounters split evenly between its levels, so they aren't named after a level:
+       the real encounter levels aren't known here, and with encounter shuffle on an encounter number has no fixed level.
+       Note: the encounter locations are shared between campaigns, so only the chosen campaign's groups mean anything for a slot.'''
+    return {get_chapter_group_name(campaign, chapter): frozenset(get_encounter_name(i) for i in encounters)
+            for campaign in All_Campaigns
+            for chapter, (_, encounters) in enumerate(campaign.chapters, 1)}
+
+@profiled
+def get_locations(campaign: Campaign, region: Region, player: int, encounters: range = None) -> List[DawnsburyLocation]:
     '''Prepare a list of properly formatted archipelago Location objects for the corresponding region'''
     locations = []
-    for i in range(1, campaign.num_encounters+1): # 1-n (inclusive)
+    if encounters is None: # 1-n (inclusive) if not specified
+        encounters = range(1, campaign.num_encounters+1)
+    for i in encounters:
         name = get_encounter_name(i)
-        locations.append(DawnsburyLocation(player, name, location_resolver_cache[name], region))
+        locations.append(DawnsburyLocation(player, name, get_location_resolver_cache()[name], region))
     return locations
 
 def get_last_location(options: DawnsburyOptions):
     '''Get the final encounter in the randomizer.'''
     return get_encounter_name(get_chosen_campaign(options).num_encounters)
 
-location_resolver_cache = make_location_cache()
\ No newline at end of file
+_dd_location_cache = {}
+def get_location_resolver_cache() -> Dict[str, int]:
+    '''Caching wrapper so the location directory is only built the first time something needs it'''
+    global _dd_location_cache
+    if not _dd_location_cache:
+        _dd_location_cache = make_location_cache()
+    return _dd_location_cache
+
+def __getattr__(name: str):
+    '''Build location_resolver_cache lazily on first access, instead of when the module is imported'''
+    if name == 'location_resolver_cache':
+        return get_location_resolver_cache()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,21 @@
+from random import Random
+from typing import List
+
+from .CampaignData import Campaign, LOOT_CATEGORIES
+from .Profiling import profiled
+
+@profiled
+def randomize_loot(campaign: Campaign, rng: Random) -> List[List[str]]:
+    '''Randomize the campaign's encounter loot within each category, and split it between the encounters like the client does.
+       Each category keeps its size, and its items are all drawn at once (weighted by how many of them the campaign normally drops).'''
+    pile = []
+    for category in LOOT_CATEGORIES:
+        loot = campaign.loot_by_category[category]
+        if loot:
+            names, weights = zip(*loot)
+            pile += rng.choices(names, weights, k=campaign.loot_counts[category])
+    rng.shuffle(pile)
+
+    # Break the randomized loot pile into equal groups, one for each encounter
+    encounters = campaign.num_encounters
+    return [pile[len(pile) * i // encounters : len(pile) * (i + 1) // encounters] for i in range(encounters)]
@@ -0,0 +1,101 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Tuple
+
+from Options import Visibility
+from Utils import parse_yamls
+from .Options import DawnsburyOptions
+
+# Bulk checking of player yamls against the dawnsbury options, without running a generation.
+GAME_NAME = "Dawnsbury Days"
+
+def validate_option_weights(weights: Dict[str, Any]) -> List[str]:
+    '''Check a yaml's "Dawnsbury Days" block, returning a list of everything wrong with it'''
+    errors = []
+    for option_name, value in weights.items():
+        option = DawnsburyOptions.type_hints.get(option_name)
+        if option is None:
+            errors.append(f"{option_name}: not a {GAME_NAME} option.")
+            continue
+
+        # Options like start_inventory take their value as is, everything else can be a dict of weights
+        if not option.supports_weighting or not isinstance(value, dict):
+            choices = [value]
+        else:
+            if any(not isinstance(weight, int) or weight < 0 for weight in value.values()):
+                errors.append(f"{option_name}: weights must be whole numbers of 0 or more.")
+                continue
+            if value and not any(value.values()):
+                errors.append(f"{option_name}: every weight is 0.")
+            choices = [choice for choice, weight in value.items() if weight]
+
+        for choice in choices:
+            # Random values would roll a different result every time, and a hidden option's only allowed value is its default
+            if option.visibility == Visibility.none and str(choice).lower().startswith('random'):
+                errors.append(f"{option_name}: hidden option can't be randomized ('{choice}').")
+                continue
+            try:
+                result = option.from_any(choice)
+            except Exception as e:
+                errors.append(f"{option_name}: '{choice}' is not a valid value ({e}).")
+                continue
+            if option.visibility == Visibility.none and result.value != option.default:
+                errors.append(f"{option_name}: hidden option can't be set to '{choice}' yet.")
+    return errors
+
+def get_dawnsbury_blocks(path: str) -> Tuple[List[Dict[str, Any]], List[str]]:
+    '''Parse a yaml file, returning the "Dawnsbury Days" block of each of its documents that can roll the game (or the parse error)'''
+    try:
+        with open(path, encoding='utf-8-sig') as file:
+            documents = list(parse_yamls(file.read()))
+    except Exception as e:
+        return [], [f"could not be parsed ({e})."]
+
+    blocks, errors = [], []
+    for document in documents:
+        if not isinstance(document, dict):
+            continue
+        game = document.get('game')
+        if game == GAME_NAME or (isinstance(game, dict) and game.get(GAME_NAME)):
+            if isinstance(document.get(GAME_NAME), dict):
+                blocks.append(document[GAME_NAME])
+            else:
+                errors.append(f"'{document.get('name')}' has no {GAME_NAME} options.")
+    return blocks, errors
+
+def validate_yaml_files(paths: Iterable[str], processes: int = None) -> Dict[str, List[str]]:
+    '''Parse and validate many yaml files in a process pool, returning the errors for each file.
+       Identical option blocks (like unedited copies of the template) are only validated once.'''
+    paths = list(paths)
+    with ProcessPoolExecutor(processes) as pool:
+        parsed = list(pool.map(get_dawnsbury_blocks, paths, chunksize=16))
+
+        # Deduplicate the option blocks before validating them
+        unique = {}
+        for blocks, _ in parsed:
+            for block in blocks:
+                unique.setdefault(json.dumps(block, sort_keys=True, default=str), block)
+        results = dict(zip(unique, pool.map(validate_option_weights, unique.values(), chunksize=16)))
+
+    report = {}
+    for path, (blocks, errors) in zip(paths, parsed):
+        for block in blocks:
+            errors += results[json.dumps(block, sort_keys=True, default=str)]
+        report[path] = errors
+    return report
+
+def validate_yaml_directory(directory: str, processes: int = None) -> Dict[str, List[str]]:
+    '''Validate every yaml file in a directory, returning the errors for each file'''
+    paths = sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(('.yaml', '.yml')))
+    return validate_yaml_files(paths, processes)
+
+# Run from the archipelago folder with: python -m worlds.dawnsbury.OptionValidation Players
+if __name__ == '__main__':
+    import sys
+    failed = False
+    for path, errors in validate_yaml_directory(sys.argv[1] if len(sys.argv) > 1 else 'Players').items():
+        for error in errors:
+            print(f"{path}: {error}")
+        failed = failed or bool(errors)
+    sys.exit(1 if failed else 0)
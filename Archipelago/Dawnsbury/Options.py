@@ -21,6 +21,12 @@ class ShuffleDifficulty(Choice):
     option_difficult = 2
     default = 1
 
+class LevelGating(Toggle):
+    """Should archipelago expect your party to have leveled up before it plays the encounters of each chapter?
+       The encounters are split evenly between the campaign's levels, and each chapter expects the party to have reached the previous chapter's level.
+       Level ups will be found earlier in the game, and the other upgrades are no longer progression items."""
+    display_name = "Level Gating"
+
 class IncludeFreeEncounters(Toggle):
     '''When encounters are shuffled, should we include the Free Encounters in the selection?
        TODO: not implemented in client yet, so its hidden.'''
@@ -37,6 +43,12 @@ class LootRandomizer(Toggle):
     display_name = "Loot Randomizer"
     visibility = Visibility.none
 
+class ScoutRewards(Toggle):
+    """Should the game be told what every encounter's archipelago reward is ahead of time, so it can show them?
+        TODO: implement this in the client"""
+    display_name = "Preview Encounter Rewards"
+    visibility = Visibility.none
+
 class Campaign(Choice):
     '''Select which campaign(s) you want to play.
        If you include DLC, you must own that dlc or the campaign will not generate.'''
@@ -62,9 +74,11 @@ class Seed(FreeText):
 class DawnsburyOptions(PerGameCommonOptions):
     encounter_shuffle: EncounterShuffle
     shuffle_difficulty: ShuffleDifficulty
+    level_gating: LevelGating
     include_free_encounters: IncludeFreeEncounters
     loot_shuffle: LootShuffle
     loot_randomizer: LootRandomizer
+    scout_rewards: ScoutRewards
     potency_runes: PotencyRunes
     campaign: Campaign
     deathlink: DeathLink
@@ -75,9 +89,11 @@ def make_option_slot_data(options: DawnsburyOptions):
     return {
         'encounter_shuffle': options.encounter_shuffle.value,
         'shuffle_difficulty': options.shuffle_difficulty.value,
+        'level_gating': options.level_gating.value,
         'include_free_encounters': options.include_free_encounters.value,
         'loot_shuffle': options.loot_shuffle.value,
         'loot_randomizer': options.loot_randomizer.value,
+        'scout_rewards': options.scout_rewards.value,
         'campaign': options.campaign.value,
         'deathlink': options.deathlink.value,
         'potency_runes': options.potency_runes.value,
@@ -0,0 +1,77 @@
+import json
+import os
+import threading
+import time
+from functools import wraps
+from typing import Dict, Hashable, Optional
+
+# Opt-in profiling of the world's generation phases and helper functions.
+# Set DAWNSBURY_PROFILE=1 to write the report to the generation's output, or set it to a file path to write it there instead.
+PROFILING_ENV_VAR = 'DAWNSBURY_PROFILE'
+PROFILE_REPORT_FILE = 'dawnsbury_profile.json'
+profiling_setting = os.environ.get(PROFILING_ENV_VAR, '')
+profiling_enabled = profiling_setting not in ('', '0')
+
+# Function name -> call count and total (inclusive) time spent in it
+_dd_profile: Dict[str, Dict[str, float]] = {}
+
+def profiled(func):
+    '''Decorator which counts and times every call to a function when profiling is enabled (otherwise it does nothing)'''
+    if not profiling_enabled:
+        return func
+
+    stats = _dd_profile.setdefault(f"{func.__module__.rpartition('.')[2]}.{func.__qualname__}", {'calls': 0, 'seconds': 0.0})
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stats['calls'] += 1
+            stats['seconds'] += time.perf_counter() - start
+    return wrapper
+
+def make_profile_report() -> dict:
+    '''Package the collected timings, slowest functions first'''
+    functions = sorted(_dd_profile.items(), key=lambda entry: entry[1]['seconds'], reverse=True)
+    return {
+        'functions': {name: {'calls': stats['calls'], 'seconds': round(stats['seconds'], 6),
+                             'seconds_per_call': round(stats['seconds'] / stats['calls'], 9) if stats['calls'] else 0}
+                      for name, stats in functions}
+    }
+
+def reset_profile():
+    '''Zero the collected timings, so the next report only covers what runs after this (the wrappers keep their stats dicts)'''
+    for stats in _dd_profile.values():
+        stats['calls'] = 0
+        stats['seconds'] = 0.0
+
+def write_profile_report(output_directory: str) -> str:
+    '''Save the profile report as json, returning the path it was saved to'''
+    path = profiling_setting if profiling_setting != '1' else os.path.join(output_directory, PROFILE_REPORT_FILE)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(make_profile_report(), file, indent=2)
+    return path
+
+# Reports waiting on the output directory and/or slots which haven't filled their slot data yet
+_dd_pending_reports: Dict[Hashable, dict] = {}
+_dd_pending_reports_lock = threading.Lock()
+
+def write_profile_report_when_done(key: Hashable, slots: int, output_directory: str = None, filled_slot: int = None) -> Optional[str]:
+    '''Write the profile report of a generation (key) once its output directory is known and all of its slots have filled their slot data.
+       Archipelago fills the slot data while (or after) it generates the output, so either one can happen last.
+       The timings are reset once the report is written, so a long running process (like the WebHost) reports each generation on its own.
+       Returns the report's path from the call which wrote it, and None from every other call.'''
+    with _dd_pending_reports_lock:
+        pending = _dd_pending_reports.setdefault(key, {'output_directory': None, 'filled': set()})
+        if output_directory is not None:
+            pending['output_directory'] = output_directory
+        if filled_slot is not None:
+            pending['filled'].add(filled_slot)
+        if pending['output_directory'] is None or len(pending['filled']) < slots:
+            return None
+        del _dd_pending_reports[key]
+        path = write_profile_report(pending['output_directory'])
+        reset_profile()
+        return path
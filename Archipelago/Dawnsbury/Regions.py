@@ -1,13 +1,13 @@
 from typing import List
 from BaseClasses import Entrance, MultiWorld, Region
 from .CampaignData import Campaign, get_chosen_campaign
-from .Locations import get_locations
+from .Locations import get_chapter_name, get_locations
 from .Options import DawnsburyOptions
 from .Rules import get_required_level_rule
 
 # Note: This must exist, even if its just one region with everything in it.
-# This could be done by chapter instead, but regions typically represent locks
-# which you need items to get through, and thats not super applicable here.
+# By default there is only one, since regions typically represent locks which you need items to get through.
+# With level gating on, each chapter (level) of the campaign is a region which you need the previous chapter's level ups to enter.
 
 # TODO: decide how to handle campaign selection.
 
@@ -18,21 +18,37 @@ def create_regions(world: MultiWorld, player: int, options: DawnsburyOptions) ->
     menu = Region('Menu', player, world)
     regions = {'Menu': menu}
 
-    # Create the campaign region
     campaign = get_chosen_campaign(options)
-    new_region = create_region(campaign, player, world)
-    regions[campaign.name] = new_region
-    link_regions(player, menu, campaign.name, new_region, 0)
+    if options.level_gating:
+        # Create a region for each chapter, each of which is entered from the last
+        previous = menu
+        for level, encounters in campaign.chapters:
+            name = get_chapter_name(campaign, level)
+            new_region = create_region(campaign, player, world, name, encounters)
+            regions[name] = new_region
+            link_regions(player, previous, name, new_region, get_required_level_ups(campaign, level))
+            previous = new_region
+    else:
+        # Create the campaign region
+        new_region = create_region(campaign, player, world)
+        regions[campaign.name] = new_region
+        link_regions(player, menu, campaign.name, new_region, 0)
 
     # Return the regions
     return regions.values()
 
 # Create a single region object with the specified parameters
-def create_region(campaign: Campaign, player: int, world: MultiWorld):
-    region = Region(campaign.name, player, world)
-    region.locations = get_locations(campaign, region, player)
+def create_region(campaign: Campaign, player: int, world: MultiWorld, name: str = None, encounters: range = None):
+    region = Region(name or campaign.name, player, world)
+    region.locations = get_locations(campaign, region, player, encounters)
     return region
 
+def get_required_level_ups(campaign: Campaign, level: int) -> int:
+    '''How many level ups (across the whole party) are needed to play the encounters of a specific level.
+       The party only needs to have reached the previous chapter's level (like the balanced shuffle, encounters can be a level above it),
+       which leaves the fill enough early locations to work with.'''
+    return max(0, level - campaign.start_level - 1) * len(campaign.characters)
+
 # Link two regions together
 def link_regions(player: int, region1: Region, connection_name: str, region2: Region, required_level_ups: int):
     exit = Entrance(player, connection_name, region1)
@@ -1,5 +1,5 @@
-from BaseClasses import CollectionState, MultiWorld
-from .Items import create_item, GAME_COMPLETE
+from BaseClasses import CollectionState, Item, MultiWorld
+from .Items import create_item, get_character_item_names, GAME_COMPLETE
 from .Locations import get_last_location
 from .Options import DawnsburyOptions
 
@@ -7,8 +7,8 @@ def set_rules(world: MultiWorld, player: int, options: DawnsburyOptions):
     '''Function used to tell the randomizer algorithm what rules our games randomization must follow.'''
 
     ### Required Unlock Rules ###
-    # We dont currently enforce any requirements for loot/levels in the generator algorithm,
-    #  but if we wanted to, for instance, add expected levels to encounters we would put them here.
+    # The only requirements are the level ups needed to enter each chapter when level gating is on,
+    #  and those are set on the entrances when the regions are made.
 
     ### Victory Conditions ###
     # Create a special 'victory' item, and place it on the final encounter
@@ -19,11 +19,25 @@ def set_rules(world: MultiWorld, player: int, options: DawnsburyOptions):
     #from Utils import visualize_regions
     #visualize_regions(world.get_region("Menu", player), "dawnsbury.puml")
 
+# Level ups are per character, so the state keeps a running total of every character's level ups under this name.
+LEVEL_UP_COUNTER = "Level Up"
+level_up_items = frozenset(get_character_item_names("Level Up"))
+
+def collect_level_up(state: CollectionState, player: int, item: Item):
+    '''Update the level up total when an item is collected'''
+    if item.name in level_up_items:
+        state.prog_items[player][LEVEL_UP_COUNTER] += 1
+
+def remove_level_up(state: CollectionState, player: int, item: Item):
+    '''Update the level up total when an item is removed'''
+    if item.name in level_up_items:
+        state.prog_items[player][LEVEL_UP_COUNTER] -= 1
+
 # Note: the wrappers are needed because afaik we need to be able to reference the player id to check items
-# Note2: Cant do this unless archipelago is randomizing the level order, so not used currently.
+# Note2: The total is kept up to date as items are collected/removed, so this is a single lookup and comparison.
 def get_required_level_rule(player: int, required_level_ups: int):
     '''Get a rule function to check if we have enough level ups to handle an encounter'''
     
     def rule(state: CollectionState) -> bool:
-        return state.has("Level Up", player, required_level_ups)
+        return state.has(LEVEL_UP_COUNTER, player, required_level_ups)
     return rule
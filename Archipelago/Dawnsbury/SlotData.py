@@ -0,0 +1,144 @@
+import base64
+import json
+import logging
+from typing import Any, Callable, Dict, List, NamedTuple, Sequence
+
+from .IdTable import BASE_OFFSET
+from .Profiling import profiled
+
+# Note: Nothing in here can depend on archipelago, since the build script loads this module by itself to check the slot data size.
+
+# Version of the slot data protocol, which the client checks against its own (must match the mod's PROTOCOL_VERSION)
+PROTOCOL_VERSION = 10300 # 1.03.00
+
+# First version of the protocol. Fields count as being there since this version, unless we know which release added them.
+FIRST_PROTOCOL_VERSION = 10000 # 1.00.00
+
+# Largest the (compact json) slot data of a slot should ever get, in bytes. The build checks the worst case of every campaign.
+SLOT_DATA_BUDGET = 4096
+
+def pack_ints(values: Sequence[int]) -> str:
+    '''Pack a list of non negative ints into a base64 string of varints (7 bits per byte, high bit set on all but the last byte)'''
+    packed = bytearray()
+    for value in values:
+        if value < 0:
+            raise ValueError(f"Can't pack negative number {value}.")
+        while value > 0x7F:
+            packed.append(value & 0x7F | 0x80)
+            value >>= 7
+        packed.append(value)
+    return base64.b64encode(packed).decode('ascii')
+
+def unpack_ints(data: str) -> List[int]:
+    '''Unpack a base64 string of varints made by pack_ints'''
+    values, value, shift = [], 0, 0
+    for byte in base64.b64decode(data):
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            values.append(value)
+            value, shift = 0, 0
+    return values
+
+def pack_encounter_loot(loot: List[List[str]]) -> Dict[str, Any]:
+    '''Pack each encounter's loot as its size followed by indexes into a list of the loot's (distinct) names'''
+    names, indexes, packed = [], {}, []
+    for encounter in loot:
+        packed.append(len(encounter))
+        for item in encounter:
+            if item not in indexes:
+                indexes[item] = len(names)
+                names.append(item)
+            packed.append(indexes[item])
+    return {'encounter_loot': pack_ints(packed), 'encounter_loot_names': names}
+
+def unpack_encounter_loot(data: Dict[str, Any]) -> List[List[str]]:
+    '''Unpack the encounter loot made by pack_encounter_loot'''
+    names, packed = data['encounter_loot_names'], iter(unpack_ints(data['encounter_loot']))
+    return [[names[next(packed)] for _ in range(size)] for size in packed]
+
+class SlotDataField(NamedTuple):
+    '''A single value in the slot data. Packed fields are left out when empty, and may be written as several keys.'''
+    name: str
+    type: type
+    default: Any # What the value is when it's missing (including in slot data from versions before it was added). Must be immutable.
+    since: int = FIRST_PROTOCOL_VERSION # Protocol version which added the field (set this for fields added after 1.03.00)
+    pack: Callable[[Any], Dict[str, Any]] = None
+    unpack: Callable[[Dict[str, Any]], Any] = None
+
+# Everything that can be in the slot data. The scalar keys are read by name by the mod, so they can't be renamed.
+SLOT_DATA_SCHEMA = (
+    # Options
+    SlotDataField('encounter_shuffle', int, 1),
+    SlotDataField('shuffle_difficulty', int, 1),
+    SlotDataField('level_gating', int, 0),
+    SlotDataField('include_free_encounters', int, 0),
+    SlotDataField('loot_shuffle', int, 1),
+    SlotDataField('loot_randomizer', int, 0),
+    SlotDataField('scout_rewards', int, 0),
+    SlotDataField('campaign', int, 0),
+    SlotDataField('deathlink', int, 0),
+    SlotDataField('potency_runes', int, 0),
+    SlotDataField('rng_seed', str, ''),
+    # Campaign metadata
+    SlotDataField('start_level', int, 1),
+    SlotDataField('end_level', int, 4),
+    SlotDataField('start_atk_bonus', int, 0),
+    SlotDataField('start_armor_bonus', int, 0),
+    SlotDataField('start_skill_bonus', int, 0),
+    SlotDataField('end_atk_bonus', int, 2),
+    SlotDataField('end_armor_bonus', int, 0),
+    SlotDataField('end_skill_bonus', int, 0),
+    SlotDataField('num_encounters', int, 21),
+    # Ids
+    SlotDataField('base_offset', int, BASE_OFFSET),
+    SlotDataField('id_checksum', str, ''),
+    # Large tables
+    SlotDataField('encounter_loot', list, (), pack=pack_encounter_loot, unpack=unpack_encounter_loot),
+    SlotDataField('encounter_rewards', list, (),
+                  pack=lambda rewards: {'encounter_rewards': pack_ints(rewards)},
+                  unpack=lambda data: unpack_ints(data['encounter_rewards'])),
+)
+
+@profiled
+def encode_slot_data(values: Dict[str, Any]) -> Dict[str, Any]:
+    '''Check the slot data values against the schema, and pack them to send to the client'''
+    unknown = values.keys() - {field.name for field in SLOT_DATA_SCHEMA}
+    if unknown:
+        raise KeyError(f"Slot data has fields which are not in the schema: {sorted(unknown)}")
+
+    slot_data = {}
+    for field in SLOT_DATA_SCHEMA:
+        value = values.get(field.name, field.default)
+        if field.pack is not None and not value:
+            continue # Empty tables are left out
+        if not isinstance(value, field.type):
+            raise TypeError(f"Slot data field {field.name} should be a {field.type.__name__}, not {type(value).__name__}.")
+        if field.pack is None:
+            slot_data[field.name] = value
+        else:
+            slot_data.update(field.pack(value))
+    slot_data['version'] = PROTOCOL_VERSION
+
+    size = get_slot_data_size(slot_data)
+    if size > SLOT_DATA_BUDGET:
+        logging.warning(f"Dawnsbury Days slot data is {size} bytes, which is over the {SLOT_DATA_BUDGET} byte budget.")
+    return slot_data
+
+def decode_slot_data(slot_data: Dict[str, Any]) -> Dict[str, Any]:
+    '''Unpack slot data made by encode_slot_data (for trackers and tools), filling in defaults for anything missing.
+       Fields added after the slot data's version always get their default.'''
+    version = slot_data.get('version', FIRST_PROTOCOL_VERSION) # The first version didn't send its version
+    values = {'version': version}
+    for field in SLOT_DATA_SCHEMA:
+        if field.since > version or field.name not in slot_data:
+            values[field.name] = field.default
+        elif field.unpack is None:
+            values[field.name] = slot_data[field.name]
+        else:
+            values[field.name] = field.unpack(slot_data)
+    return values
+
+def get_slot_data_size(slot_data: Dict[str, Any]) -> int:
+    '''Get the size of the slot data as (compact) json, which is roughly what is sent on every connect'''
+    return len(json.dumps(slot_data, separators=(',', ':')).encode('utf-8'))
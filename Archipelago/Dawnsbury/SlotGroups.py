@@ -0,0 +1,28 @@
+from types import MappingProxyType
+from typing import Any, Collection, Mapping, NamedTuple, Optional, Tuple
+
+from .CampaignData import make_campaign_metadata
+from .IdTable import get_id_table
+from .Items import PoolTemplate, get_pool_template, get_progression_items
+from .Options import DawnsburyOptions, make_option_slot_data
+from .Profiling import profiled
+
+class SlotGroup(NamedTuple):
+    '''Generation data shared by every slot with the same options (so it's only made once for all of them)'''
+    pool_template: PoolTemplate
+    progression_items: Optional[Collection[str]]
+    slot_data: Mapping[str, Any] # The slot data which doesn't depend on the seed (options, campaign metadata and ids)
+
+def get_slot_group_key(options: DawnsburyOptions) -> Tuple:
+    '''Get the values of every option which goes in the slot data, so that slots with the same key generate from the same data'''
+    return tuple(make_option_slot_data(options).values())
+
+@profiled
+def make_slot_group(options: DawnsburyOptions) -> SlotGroup:
+    '''Make the data shared by every slot with these options'''
+    slot_data = make_option_slot_data(options)
+    slot_data.update(make_campaign_metadata(options))
+    id_table = get_id_table()
+    slot_data['base_offset'] = id_table['base_offset']
+    slot_data['id_checksum'] = id_table['checksum'] # Lets the client check that its ids match ours
+    return SlotGroup(get_pool_template(options), get_progression_items(options), MappingProxyType(slot_data))
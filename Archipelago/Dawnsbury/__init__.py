@@ -1,9 +1,16 @@
-from .CampaignData import make_campaign_metadata
-from .Items import BASE_OFFSET, create_item, create_items, ap_get_all_items, DawnsburyItem
-from .Locations import location_resolver_cache
-from .Options import make_option_slot_data, DawnsburyOptions
+import logging
+from typing import List, Optional
+
+from .CampaignData import get_chosen_campaign
+from .Items import create_item, create_items, ap_get_all_items, make_item_name_groups, pool_template_cache_stats, DawnsburyItem
+from .Loot import randomize_loot
+from .Locations import get_location_resolver_cache, make_location_name_groups, make_reward_table
+from .Options import DawnsburyOptions
+from .Profiling import profiled, profiling_enabled, write_profile_report_when_done
 from .Regions import create_regions
-from .Rules import set_rules
+from .Rules import collect_level_up, remove_level_up, set_rules
+from .SlotData import encode_slot_data
+from .SlotGroups import SlotGroup, get_slot_group_key, make_slot_group
 from ..AutoWorld import World
 
 class DawnsburyWorld(World):
@@ -18,24 +25,107 @@ class DawnsburyWorld(World):
     required_client_version = (0, 3, 7)
 
     # Required name/id resolution dicts for the superclass
+    # Note: the world registry reads these when the class is made, so this is the first (and only) place they get built.
     item_name_to_id = ap_get_all_items()
-    location_name_to_id = location_resolver_cache
+    location_name_to_id = get_location_resolver_cache()
+
+    # Precomputed groups of names, so hints and trackers can ask for ie "Saffi", "Level Up" or "The Profane Barrier Chapter 2"
+    item_name_groups = make_item_name_groups()
+    location_name_groups = make_location_name_groups()
+
+    # Data shared with every other slot that has the same options (set in stage_generate_early)
+    slot_group: Optional[SlotGroup] = None
+
+    # The loot each encounter drops (if the loot randomizer is on)
+    encounter_loot: List[List[str]] = []
+
+    # What every encounter location holds (made after the fill, if the reward preview is on)
+    encounter_rewards: List[int] = []
+
+    @profiled
+    def generate_early(self):
+        if self.options.loot_randomizer:
+            self.encounter_loot = randomize_loot(get_chosen_campaign(self.options), self.random)
+
+    @classmethod
+    @profiled
+    def stage_generate_early(cls, multiworld):
+        '''Group every dawnsbury slot by its options, so the data each group shares is only made once'''
+        groups = {}
+        for world in multiworld.get_game_worlds(cls.game):
+            groups.setdefault(get_slot_group_key(world.options), []).append(world)
+
+        for worlds in groups.values():
+            slot_group = make_slot_group(worlds[0].options)
+            for world in worlds:
+                world.slot_group = slot_group
+        logging.debug(f"Dawnsbury Days: sharing generation data between {len(groups)} option groups.")
 
+    def get_slot_group(self) -> SlotGroup:
+        '''Get the data shared with the slot's group, making it for this slot alone if stage_generate_early didn't run (ie for create_item before it)'''
+        if self.slot_group is None:
+            self.slot_group = make_slot_group(self.options)
+        return self.slot_group
+
+    @profiled
     def create_item(self, name: str) -> DawnsburyItem:
-        return create_item(name, self.player)
+        return create_item(name, self.player, self.get_slot_group().progression_items)
 
+    @profiled
     def create_items(self):
-        self.multiworld.itempool += create_items(self.player, self.options)
+        slot_group = self.get_slot_group()
+        self.multiworld.itempool += create_items(self.player, slot_group.pool_template, self.random, slot_group.progression_items)
 
+    @profiled
     def create_regions(self):
         self.multiworld.regions += create_regions(self.multiworld, self.player, self.options)
 
+    @profiled
     def set_rules(self):
         set_rules(self.multiworld, self.player, self.options)
 
+    def collect(self, state, item) -> bool:
+        change = super().collect(state, item)
+        if change:
+            collect_level_up(state, self.player, item)
+        return change
+
+    def remove(self, state, item) -> bool:
+        change = super().remove(state, item)
+        if change:
+            remove_level_up(state, self.player, item)
+        return change
+
+    @profiled
+    def post_fill(self):
+        if self.options.scout_rewards:
+            self.encounter_rewards = make_reward_table(self.multiworld.get_locations(self.player))
+
     def fill_slot_data(self) -> dict:
-        slot_data = make_option_slot_data(self.options)
-        slot_data.update(make_campaign_metadata(self.options))
-        slot_data['base_offset'] = BASE_OFFSET
-        slot_data['version'] = 10300 # 1.03.00
+        slot_data = self.make_slot_data()
+        if profiling_enabled:
+            self.report_profile_when_done(self.multiworld, filled_slot=self.player)
         return slot_data
+
+    @profiled
+    def make_slot_data(self) -> dict:
+        '''Make the slot data (kept separate from fill_slot_data so that its timing is done before the profile report is written)'''
+        slot_data = dict(self.get_slot_group().slot_data)
+        if self.options.loot_randomizer:
+            slot_data['encounter_loot'] = self.encounter_loot
+        if self.options.scout_rewards:
+            slot_data['encounter_rewards'] = self.encounter_rewards
+        return encode_slot_data(slot_data)
+
+    @classmethod
+    def stage_generate_output(cls, multiworld, output_directory: str):
+        logging.debug(f"Dawnsbury Days item pool template cache: {pool_template_cache_stats}")
+        if profiling_enabled:
+            cls.report_profile_when_done(multiworld, output_directory=output_directory)
+
+    @classmethod
+    def report_profile_when_done(cls, multiworld, **progress):
+        '''Write the profile report after the output directory is known and the last slot data is filled (whichever is last)'''
+        path = write_profile_report_when_done(id(multiworld), len(multiworld.get_game_worlds(cls.game)), **progress)
+        if path:
+            logging.info(f"Dawnsbury Days profile report saved to {path}")
@@ -1,3 +1,148 @@
-import shutil
-shutil.make_archive('dawnsbury', 'zip', root_dir='.', base_dir='dawnsbury')
-shutil.move('dawnsbury.zip', 'dawnsbury.apworld')
\ No newline at end of file
+import argparse
+import json
+import os
+import py_compile
+import re
+import subprocess
+import sys
+import tempfile
+import types
+import zipfile
+from importlib.util import MAGIC_NUMBER
+from random import Random
+from typing import Dict, List, Tuple
+
+WORLD_DIR = 'dawnsbury' # Name of the world's package (inside the apworld)
+SOURCE_DIR = 'Dawnsbury' # Folder the world's sources are in (case matters on most filesystems)
+APWORLD = 'dawnsbury.apworld'
+MANIFEST = 'dawnsbury.manifest.json'
+BUILD_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# The mod's copy of the id table checksum, which it checks the slot data's id_checksum against
+MOD_CLIENT = os.path.join(BUILD_DIR, '..', 'Mod', 'ArchipelagoClient.cs')
+
+# The world is imported (and timed) as archipelago would, using the test stand-ins in place of archipelago itself
+PACKAGE = f'worlds.{WORLD_DIR}'
+STANDINS_DIR = os.path.join(BUILD_DIR, 'tests', 'standins')
+IMPORT_BUDGET_MS = 50
+
+def load_world_module(name: str, world_path: str = os.path.join(BUILD_DIR, SOURCE_DIR)) -> types.ModuleType:
+    '''Load one of the world's modules without running the package's __init__ (which needs archipelago to import)'''
+    if WORLD_DIR not in sys.modules:
+        package = types.ModuleType(WORLD_DIR)
+        package.__path__ = [world_path]
+        sys.modules[WORLD_DIR] = package
+    # Note: use __import__ (not importlib) so that python -X importtime reports the import
+    __import__(f'{WORLD_DIR}.{name}')
+    return sys.modules[f'{WORLD_DIR}.{name}']
+
+def get_world_sources() -> List[str]:
+    '''Get the world's source files, in the order they are stored in the archive (package first)'''
+    sources = sorted(name for name in os.listdir(os.path.join(BUILD_DIR, SOURCE_DIR)) if name.endswith('.py'))
+    sources.remove('__init__.py')
+    return ['__init__.py'] + sources
+
+def compile_source(path: str) -> bytes:
+    '''Compile a source file to bytecode which zipimport will use without checking it against the source'''
+    with tempfile.TemporaryDirectory() as temp:
+        compiled = py_compile.compile(path, cfile=os.path.join(temp, 'module.pyc'), doraise=True,
+                                      invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH)
+        with open(compiled, 'rb') as file:
+            return file.read()
+
+def write_apworld(path: str) -> List[Dict[str, object]]:
+    '''Package the world's sources, their bytecode, and the id table. Returns the list of what was packaged.'''
+    IdTable = load_world_module('IdTable')
+    members = []
+    with zipfile.ZipFile(path, 'w') as archive:
+        for source in get_world_sources():
+            source_path = os.path.join(BUILD_DIR, SOURCE_DIR, source)
+            archive.write(source_path, f'{WORLD_DIR}/{source}', zipfile.ZIP_DEFLATED)
+
+            # zipimport looks for bytecode next to the source (not in __pycache__), and only uses it if it's for the same python version.
+            # Store it uncompressed so loading it is just a read.
+            archive.writestr(f'{WORLD_DIR}/{source}c', compile_source(source_path), zipfile.ZIP_STORED)
+
+        archive.writestr(f'{WORLD_DIR}/{IdTable.ID_TABLE_FILE}', IdTable.serialize_id_table(), zipfile.ZIP_DEFLATED)
+
+        for info in archive.infolist():
+            members.append({'name': info.filename, 'size': info.file_size, 'stored_size': info.compress_size})
+    return members
+
+def get_mod_id_checksum(path: str = MOD_CLIENT) -> str:
+    '''Read the id table checksum that the mod was written against'''
+    with open(path, encoding='utf-8') as file:
+        match = re.search(r'ID_TABLE_CHECKSUM = "([0-9a-f]*)"', file.read())
+    return match.group(1) if match else None
+
+def measure_import_times(path: str) -> Tuple[Dict[str, int], int]:
+    '''Import the packaged world as worlds.dawnsbury in a fresh interpreter, like archipelago does, on top of the test stand-ins for archipelago.
+       The stand-ins are imported first, so they aren't counted (archipelago's own modules are already loaded when it imports a world).
+       Returns each of the world's modules' own import time, and the world's total import time including everything it imported (in us)'''
+    script = (f'import sys; sys.path.insert(0, {STANDINS_DIR!r}); import BaseClasses, Options, worlds.AutoWorld; '
+              f'worlds.__path__.append({path!r}); __import__({PACKAGE!r})')
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', script],
+                            cwd=BUILD_DIR, capture_output=True, text=True, check=True)
+
+    # Lines look like "import time:  self [us] | cumulative | imported package", with nested imports indented
+    times, total = {}, 0
+    for line in result.stderr.splitlines():
+        fields = line.removeprefix('import time:').split('|')
+        if len(fields) == 3 and fields[2].strip().startswith(PACKAGE):
+            times[fields[2].strip()] = int(fields[0])
+            if fields[2].startswith(' ' + PACKAGE): # Top level import, so its cumulative time covers everything under it
+                total += int(fields[1])
+    return times, total
+
+def measure_slot_data_sizes() -> Dict[str, int]:
+    '''Encode the largest slot data each campaign can have (every table turned on, with the biggest possible ids), returning their sizes in bytes'''
+    CampaignData, Loot, SlotData = (load_world_module(name) for name in ('CampaignData', 'Loot', 'SlotData'))
+    sizes = {}
+    for campaign in CampaignData.All_Campaigns:
+        slot_data = dict(CampaignData.get_campaign_metadata(campaign), loot_randomizer=1, scout_rewards=1, id_checksum='0' * 16,
+                         encounter_loot=Loot.randomize_loot(campaign, Random(0)),
+                         encounter_rewards=[2**53 - 1, 0xFFFF, 0xFF] * campaign.num_encounters)
+        sizes[campaign.name] = SlotData.get_slot_data_size(SlotData.encode_slot_data(slot_data))
+    return sizes
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build the dawnsbury days apworld.')
+    parser.add_argument('--import-budget-ms', type=float, default=IMPORT_BUDGET_MS,
+                        help='Fail the build if importing the packaged world takes longer than this')
+    parser.add_argument('--slot-data-budget', type=int, default=load_world_module('SlotData').SLOT_DATA_BUDGET,
+                        help='Fail the build if any campaign\'s largest possible slot data is bigger than this many bytes')
+    args = parser.parse_args()
+
+    # The mod works its ids out by itself, so make sure that they still match the apworld's before building
+    id_checksum = load_world_module('IdTable').make_id_table()['checksum']
+    mod_id_checksum = get_mod_id_checksum()
+    if mod_id_checksum != id_checksum:
+        sys.exit(f"Build failed: the mod's ID_TABLE_CHECKSUM ({mod_id_checksum}) doesn't match the id table ({id_checksum}). "
+                 "Update the mod's ids (and the checksum) in Mod/ArchipelagoClient.cs to match.")
+
+    apworld_path = os.path.join(BUILD_DIR, APWORLD)
+    members = write_apworld(apworld_path)
+    import_times, total_us = measure_import_times(apworld_path)
+    total_ms = total_us / 1000
+    slot_data_sizes = measure_slot_data_sizes()
+
+    # Save a manifest of what was built, and how long it took to import
+    with open(os.path.join(BUILD_DIR, MANIFEST), 'w', encoding='utf-8') as file:
+        json.dump({
+            'python': sys.implementation.cache_tag,
+            'bytecode_magic': MAGIC_NUMBER.hex(),
+            'id_checksum': id_checksum,
+            'members': members,
+            'import_time_us': import_times,
+            'import_time_ms': total_ms,
+            'import_budget_ms': args.import_budget_ms,
+            'slot_data_bytes': slot_data_sizes,
+            'slot_data_budget': args.slot_data_budget,
+        }, file, indent=2)
+
+    print(f"Built {APWORLD} for {sys.implementation.cache_tag}: imports in {total_ms:.2f}ms (budget {args.import_budget_ms}ms)")
+    if total_ms > args.import_budget_ms:
+        sys.exit(f"Build failed: importing the world took {total_ms:.2f}ms, which is over the {args.import_budget_ms}ms budget.")
+    for name, size in slot_data_sizes.items():
+        if size > args.slot_data_budget:
+            sys.exit(f"Build failed: {name}'s slot data can be {size} bytes, which is over the {args.slot_data_budget} byte budget.")
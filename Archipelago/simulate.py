@@ -0,0 +1,126 @@
+import argparse
+import json
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from build import load_world_module
+
+# Headless Monte Carlo simulation of how far ahead/behind the party's level is compared to the encounters they fight.
+# This is an offline tool (it isn't packaged in the apworld), so it can use numpy to simulate every seed of a batch at once.
+CampaignData = load_world_module('CampaignData')
+
+# How many levels above its place in the campaign an encounter can be, for each shuffle difficulty (simple, balanced, difficult)
+DIFFICULTY_LEVEL_ALLOWANCE = (0, 1, 99)
+DIFFICULTY_NAMES = ('simple', 'balanced', 'difficult')
+
+# Saved with every report, so that nobody reads the distributions as real campaign data
+SIMULATION_WARNINGS = [
+    "Encounter levels are approximated: the apworld doesn't know each encounter's real level, so the encounters are split evenly between the campaign's levels.",
+    "Expected weapon bonuses are approximated: they're spread evenly over the campaign's levels, not taken from the unrandomized campaign.",
+    "Armor and skill upgrades are not modeled (they are treated as filler).",
+]
+
+def get_encounter_levels(campaign) -> List[int]:
+    '''Get the level of each encounter in campaign order.
+       The apworld doesn't know the real encounter levels, so use the chapters (encounters spread evenly between levels)'''
+    return [level for level, encounters in campaign.chapters for _ in encounters]
+
+def shuffle_encounter_levels(levels: np.ndarray, allowance: int, seeds: int, rng: np.random.Generator) -> np.ndarray:
+    '''Shuffle the encounters of many seeds like the client does: every spot gets a random unused encounter of at most its level + the allowance.
+       Returns the level of the encounter played at each spot, for each seed'''
+    # Count the unused encounters of each level, for every seed
+    lowest = levels.min()
+    remaining = np.tile(np.bincount(levels - lowest), (seeds, 1))
+    rows = np.arange(seeds)
+
+    result = np.empty((seeds, len(levels)), dtype=np.int64)
+    for spot, level in enumerate(levels):
+        below = remaining.cumsum(axis=1)
+
+        # If there aren't any valid encounters left, raise the limit until there are (same as the client)
+        limit = np.maximum(min(level + allowance - lowest, remaining.shape[1] - 1), (below > 0).argmax(axis=1))
+
+        # Pick a random valid encounter, and find the level bucket it is in
+        pick = (rng.random(seeds) * below[rows, limit]).astype(np.int64)
+        bucket = (below > pick[:, None]).argmax(axis=1)
+        remaining[rows, bucket] -= 1
+        result[:, spot] = bucket + lowest
+    return result
+
+def get_party_progress(campaign, seeds: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    '''Spread each character's level ups and weapon upgrades randomly over the locations (the last one is always the victory item), for many seeds.
+       Returns the party level and the party's weapon bonus (averages over the characters, rounded down) at each encounter, for each seed.
+       The armor and skill upgrades don't change either one, so they're just filler here (and they're trimmed first when the pool is too big).'''
+    characters = len(CampaignData.DEFAULT_CHARACTERS)
+    level_ups = characters * (campaign.end_level - campaign.start_level)
+    weapon_upgrades = characters * (campaign.end_atk_bonus - campaign.start_atk_bonus)
+    slots = campaign.num_encounters - 1
+
+    # Give every location a random rank: the lowest ranks hold the level ups, and the next ones the weapon upgrades
+    ranks = rng.random((seeds, slots)).argsort(axis=1)
+    is_level_up = ranks < level_ups
+    is_weapon_upgrade = (ranks >= level_ups) & (ranks < level_ups + weapon_upgrades)
+
+    # The item from an encounter's location arrives after that encounter is cleared
+    levels = np.zeros((seeds, campaign.num_encounters), dtype=np.int64)
+    levels[:, 1:] = is_level_up.cumsum(axis=1)
+    weapon_bonuses = np.zeros((seeds, campaign.num_encounters), dtype=np.int64)
+    weapon_bonuses[:, 1:] = is_weapon_upgrade.cumsum(axis=1)
+    return campaign.start_level + levels // characters, campaign.start_atk_bonus + weapon_bonuses // characters
+
+def get_expected_weapon_bonuses(campaign, levels: np.ndarray) -> np.ndarray:
+    '''Get the weapon bonus an unrandomized party would have at each encounter level (spread evenly over the campaign's levels, rounded down)'''
+    bonuses = campaign.end_atk_bonus - campaign.start_atk_bonus
+    return campaign.start_atk_bonus + (levels - campaign.start_level) * bonuses // max(1, campaign.end_level - campaign.start_level)
+
+def count_values(values: np.ndarray) -> Counter:
+    values, counts = np.unique(values, return_counts=True)
+    return Counter(dict(zip(values.tolist(), counts.tolist())))
+
+def simulate_seeds(campaign, difficulty: int, seeds: int, rng: np.random.Generator) -> Tuple[Counter, Counter]:
+    '''Simulate a batch of seeds for a campaign and shuffle difficulty.
+       Returns the counts of each party level - encounter level delta, and of each party weapon bonus - expected weapon bonus delta'''
+    levels = np.array(get_encounter_levels(campaign))
+    party_levels, weapon_bonuses = get_party_progress(campaign, seeds, rng)
+    encounter_levels = shuffle_encounter_levels(levels, DIFFICULTY_LEVEL_ALLOWANCE[difficulty], seeds, rng)
+    return count_values(party_levels - encounter_levels), count_values(weapon_bonuses - get_expected_weapon_bonuses(campaign, encounter_levels))
+
+def get_distribution(deltas: Counter) -> Dict[int, float]:
+    encounters = sum(deltas.values())
+    return {delta: round(count / encounters, 6) for delta, count in sorted(deltas.items())}
+
+def run_simulation(seeds: int, seed: int = 0, batch_size: int = 100000) -> dict:
+    '''Simulate the given number of seeds for every campaign and shuffle difficulty.
+       Returns the distributions of party level - encounter level and party weapon bonus - expected weapon bonus, by campaign name and difficulty'''
+    report = {'warnings': SIMULATION_WARNINGS, 'campaigns': {}}
+    for c, campaign in enumerate(CampaignData.All_Campaigns):
+        for difficulty, name in enumerate(DIFFICULTY_NAMES):
+            rng = np.random.default_rng([seed, c, difficulty])
+            level_deltas, weapon_deltas = Counter(), Counter()
+            for first in range(0, seeds, batch_size):
+                batch_level_deltas, batch_weapon_deltas = simulate_seeds(campaign, difficulty, min(batch_size, seeds - first), rng)
+                level_deltas.update(batch_level_deltas)
+                weapon_deltas.update(batch_weapon_deltas)
+            report['campaigns'].setdefault(campaign.name, {})[name] = {'level': get_distribution(level_deltas),
+                                                                       'weapon_bonus': get_distribution(weapon_deltas)}
+    return report
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Simulate how far the party level is from the encounter level across many seeds.')
+    parser.add_argument('--seeds', type=int, default=10000, help='Number of seeds to simulate for each campaign and shuffle difficulty')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the simulation itself')
+    parser.add_argument('--output', default=None, help='Save the results to this json file instead of printing them')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    report = run_simulation(args.seeds, args.seed)
+    print(f"Simulated {args.seeds} seeds per campaign and difficulty in {time.perf_counter() - start:.2f}s")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
@@ -0,0 +1,192 @@
+import argparse
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from random import Random
+from typing import Callable, Dict, List, Tuple
+
+from harness import POST_FILL_STEPS, PRE_FILL_STEPS, create_multiworld, fill, get_option_combinations, make_options, \
+    place_randomly
+
+from worlds.dawnsbury.Items import PoolTemplate, create_items, get_pool_template, get_progression_items, trim_item_list
+from worlds.dawnsbury.CampaignData import All_Campaigns, Campaign
+from worlds.dawnsbury.Loot import randomize_loot
+from worlds.dawnsbury.Options import DawnsburyOptions
+from worlds.dawnsbury.SlotData import pack_encounter_loot
+
+from worlds.AutoWorld import call_all
+
+# Benchmarks of the world's generation steps, run offline on the test harness's stand-ins.
+# Run from the Archipelago folder with: python tests/bench.py --output results.json
+# The results are json so that runs on different commits can be compared. Only the world's own steps are timed (not the harness's fill).
+# Note: the stand-ins are simpler than archipelago's classes, so the numbers are only comparable with other runs of this script.
+
+def measure_allocations(func: Callable, *args) -> int:
+    '''Get the peak memory allocated by a call (in bytes), run separately from the timings since tracing slows everything down'''
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def time_best(func: Callable, repeat: int, *args) -> float:
+    '''Get the fastest time (in seconds) of a few calls, which is the least noisy for short benchmarks'''
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def time_generation(option_sets: List[dict], seed: int = 0, fill: Callable = fill) -> Tuple[Dict[str, float], int]:
+    '''Generate a multiworld with a dawnsbury slot for each set of options, timing each of the world's steps.
+       Returns the seconds spent in each step (for all slots together) and the number of items created.'''
+    multiworld = create_multiworld(*option_sets, seed=seed)
+    seconds = {}
+    for step in PRE_FILL_STEPS:
+        start = time.perf_counter()
+        call_all(multiworld, step)
+        seconds[step] = time.perf_counter() - start
+    fill(multiworld)
+    for step in POST_FILL_STEPS:
+        start = time.perf_counter()
+        call_all(multiworld, step)
+        seconds[step] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for world in multiworld.worlds.values():
+        world.fill_slot_data()
+    seconds['fill_slot_data'] = time.perf_counter() - start
+    return seconds, len(multiworld.itempool)
+
+def bench_option_combinations(repeat: int) -> dict:
+    '''Generate a single slot with every option combination'''
+    combinations = get_option_combinations()
+    seconds, items = {}, 0
+    for seed in range(repeat):
+        for options in combinations:
+            step_seconds, created = time_generation([options], seed)
+            for step, step_time in step_seconds.items():
+                seconds[step] = seconds.get(step, 0.0) + step_time
+            items += created
+
+    total = sum(seconds.values())
+    peak = max(measure_allocations(time_generation, [options]) for options in combinations)
+    return {
+        'generations': repeat * len(combinations),
+        'items_per_second': round(items / total),
+        'phases_per_second': round(len(seconds) * repeat * len(combinations) / total),
+        'peak_allocated_bytes': peak,
+        'step_seconds': {step: round(step_time, 6) for step, step_time in seconds.items()},
+    }
+
+def create_slot_pools(slot_options: List[DawnsburyOptions], seed: int = 0) -> list:
+    '''Create the item pool of a slot for each set of options (like the world's create_items), returning all of the items'''
+    rng = Random(seed)
+    items = []
+    for player, options in enumerate(slot_options, 1):
+        items += create_items(player, get_pool_template(options), rng, get_progression_items(options))
+    return items
+
+def bench_create_items(repeat: int) -> dict:
+    '''Create the item pools of 1, 100 and 1000 slots (cycling through the option combinations)'''
+    combinations = [make_options(**options) for options in get_option_combinations()]
+    results = {}
+    for slots in (1, 100, 1000):
+        slot_options = [combinations[i % len(combinations)] for i in range(slots)]
+        items = len(create_slot_pools(slot_options))
+        seconds = time_best(create_slot_pools, repeat, slot_options)
+        results[str(slots)] = {'items': items, 'seconds': round(seconds, 6), 'items_per_second': round(items / seconds),
+                               'peak_allocated_bytes': measure_allocations(create_slot_pools, slot_options)}
+    return results
+
+def trim_pools(template: PoolTemplate, trims: int) -> list:
+    '''Trim the same pool template with a different seed each time'''
+    return [trim_item_list(template, Random(seed)) for seed in range(trims)]
+
+def bench_trim(repeat: int, trims: int = 1000) -> dict:
+    '''Trim the profane barrier's pool (the only one which needs it) by its real amount, and by more to cover every priority bucket'''
+    template = get_pool_template(make_options(campaign=1))
+    results = {}
+    for extra in (template.extra, 6, 12):
+        oversized = template._replace(extra=extra)
+        seconds = time_best(trim_pools, repeat, oversized, trims)
+        results[str(extra)] = {'trims': trims, 'seconds': round(seconds, 6), 'trims_per_second': round(trims / seconds),
+                               'items_per_second': round(trims * len(template.names) / seconds),
+                               'peak_allocated_bytes': measure_allocations(trim_pools, oversized, trims)}
+    return results
+
+def randomize_slot_loot(campaign: Campaign, slots: int) -> list:
+    '''Randomize and pack the encounter loot of many slots of a campaign, like fill_slot_data does with the loot randomizer on'''
+    return [pack_encounter_loot(randomize_loot(campaign, Random(seed))) for seed in range(slots)]
+
+def bench_loot(repeat: int, slots: int = 1000) -> dict:
+    '''Randomize the loot of a 1000 slot generation of each campaign'''
+    results = {}
+    for campaign in All_Campaigns:
+        loot = sum(map(len, randomize_loot(campaign, Random(0))))
+        seconds = time_best(randomize_slot_loot, repeat, campaign, slots)
+        results[campaign.name] = {'slots': slots, 'seconds': round(seconds, 6), 'slots_per_second': round(slots / seconds),
+                                  'items_per_second': round(slots * loot / seconds),
+                                  'peak_allocated_bytes': measure_allocations(randomize_slot_loot, campaign, slots)}
+    return results
+
+def bench_slots(repeat: int) -> dict:
+    '''Generate multiworlds of 50, 200 and 500 dawnsbury slots (cycling through the option combinations).
+       The items are placed without logic, since the harness's fill would take far longer than the world's steps.'''
+    combinations = get_option_combinations()
+    results = {}
+    for slots in (50, 200, 500):
+        option_sets = [combinations[i % len(combinations)] for i in range(slots)]
+        best, best_seconds = float('inf'), {}
+        for seed in range(repeat):
+            step_seconds, _ = time_generation(option_sets, seed, place_randomly)
+            if sum(step_seconds.values()) < best:
+                best, best_seconds = sum(step_seconds.values()), step_seconds
+        results[str(slots)] = {'seconds': round(best, 6), 'slots_per_second': round(slots / best),
+                               'step_seconds': {step: round(step_time, 6) for step, step_time in best_seconds.items()}}
+    return results
+
+# Benchmark name -> function taking the number of repeats
+BENCHMARKS: Dict[str, Callable[[int], dict]] = {
+    'option_combinations': bench_option_combinations,
+    'slots': bench_slots,
+    'create_items': bench_create_items,
+    'trim': bench_trim,
+    'loot': bench_loot,
+}
+
+def get_commit() -> str:
+    '''Get the commit being benchmarked (if this is a git checkout)'''
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+def run_benchmarks(names: List[str], repeat: int) -> dict:
+    results = {'commit': get_commit(), 'python': platform.python_version(), 'repeat': repeat, 'benchmarks': {}}
+    for name in names:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()): # The world prints its warnings (like trimming the pool) on every generation
+            results['benchmarks'][name] = BENCHMARKS[name](repeat)
+        print(f"{name}: {time.perf_counter() - start:.2f}s")
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the world's generation steps on the test harness.")
+    parser.add_argument('--output', default=None, help='Save the results to this json file instead of printing them')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of times (seeds) to run each benchmark')
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS), help='Benchmarks to run')
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.only, args.repeat)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
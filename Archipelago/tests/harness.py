@@ -0,0 +1,115 @@
+import importlib.util
+import os
+import sys
+from itertools import product
+from typing import Callable, Dict, Iterable, List
+
+# Offline test harness for the world: loads it as worlds.dawnsbury on top of stand-ins for archipelago's
+#  BaseClasses/Options/AutoWorld (in the standins folder), and runs its generation steps with a simple fill.
+# Note: the stand-ins only do what the world uses, and the fill never swaps items, so it fails on seeds that archipelago might rescue.
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+STANDINS_DIR = os.path.join(TESTS_DIR, 'standins')
+WORLD_PATH = os.path.join(TESTS_DIR, '..', 'Dawnsbury')
+
+def load_world():
+    '''Load the world package as worlds.dawnsbury (like archipelago does), using the stand-ins'''
+    if 'worlds.dawnsbury' not in sys.modules:
+        sys.path.insert(0, STANDINS_DIR)
+        spec = importlib.util.spec_from_file_location('worlds.dawnsbury', os.path.join(WORLD_PATH, '__init__.py'),
+                                                      submodule_search_locations=[WORLD_PATH])
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+    return sys.modules['worlds.dawnsbury']
+
+dawnsbury = load_world()
+from BaseClasses import CollectionState, MultiWorld
+from worlds.AutoWorld import call_all
+
+# The options which change what gets generated, and the values to test for each
+GENERATION_OPTIONS: Dict[str, Iterable] = {
+    'campaign': range(len(dawnsbury.CampaignData.All_Campaigns)),
+    'level_gating': (0, 1),
+    'potency_runes': (0, 1),
+    'loot_randomizer': (0, 1),
+    'scout_rewards': (0, 1),
+}
+
+class FillError(Exception):
+    pass
+
+def get_option_combinations(**choices: Iterable) -> List[dict]:
+    '''Get every combination of the generation options (any option can be given its own values to test instead)'''
+    choices = {**GENERATION_OPTIONS, **choices}
+    return [dict(zip(choices, values)) for values in product(*choices.values())]
+
+def make_options(**values) -> 'dawnsbury.DawnsburyOptions':
+    '''Make a set of options, using the default for anything not given'''
+    options = dawnsbury.DawnsburyOptions.type_hints
+    return dawnsbury.DawnsburyOptions(**{name: option.from_any(values.get(name, option.default)) for name, option in options.items()})
+
+def fill(multiworld: MultiWorld):
+    '''Place the item pool like archipelago's fill_restrictive (assuming every unplaced item is found), but without swapping'''
+    rng = multiworld.random
+    locations = [location for location in multiworld.get_locations() if location.item is None]
+    rng.shuffle(locations)
+    progression = [item for item in multiworld.itempool if item.advancement]
+    rng.shuffle(progression)
+
+    while progression:
+        item = progression.pop()
+        state = CollectionState(multiworld)
+        for unplaced in progression:
+            state.collect(unplaced)
+        state.sweep()
+
+        location = next((location for location in locations if location.can_reach(state)), None)
+        if location is None:
+            raise FillError(f"No reachable location left for {item.name} (player {item.player}), with {len(progression)} progression items left.")
+        locations.remove(location)
+        location.item, item.location = item, location
+
+    rest = [item for item in multiworld.itempool if not item.advancement]
+    if len(rest) > len(locations):
+        raise FillError(f"{len(rest)} items left for {len(locations)} locations.")
+    for item, location in zip(rest, locations):
+        location.item, item.location = item, location
+
+def place_randomly(multiworld: MultiWorld):
+    '''Place the item pool without any logic, for benchmarks of the steps around the fill (with too many slots for fill to be quick)'''
+    locations = [location for location in multiworld.get_locations() if location.item is None]
+    multiworld.random.shuffle(locations)
+    if len(multiworld.itempool) > len(locations):
+        raise FillError(f"{len(multiworld.itempool)} items left for {len(locations)} locations.")
+    for item, location in zip(multiworld.itempool, locations):
+        location.item, item.location = item, location
+
+# The world's generation steps before and after the fill, in the order archipelago calls them
+PRE_FILL_STEPS = ('generate_early', 'create_regions', 'create_items', 'set_rules', 'generate_basic', 'pre_fill')
+POST_FILL_STEPS = ('post_fill',)
+
+def create_multiworld(*option_sets: dict, seed: int = 0) -> MultiWorld:
+    '''Make a multiworld with a dawnsbury slot for each set of options, before any generation steps'''
+    multiworld = MultiWorld(len(option_sets), seed)
+    for player, values in zip(multiworld.player_ids, option_sets):
+        world = dawnsbury.DawnsburyWorld(multiworld, player)
+        world.options = make_options(**values)
+        multiworld.worlds[player] = world
+    return multiworld
+
+def generate(*option_sets: dict, seed: int = 0, fill: Callable[[MultiWorld], None] = fill) -> MultiWorld:
+    '''Run the generation steps for a dawnsbury slot with each set of options, up to and including post_fill'''
+    multiworld = create_multiworld(*option_sets, seed=seed)
+    for step in PRE_FILL_STEPS:
+        call_all(multiworld, step)
+    fill(multiworld)
+    for step in POST_FILL_STEPS:
+        call_all(multiworld, step)
+    return multiworld
+
+def is_beatable(multiworld: MultiWorld) -> bool:
+    '''Check that every location can be reached and every slot can finish, starting with nothing'''
+    state = CollectionState(multiworld)
+    collected = state.sweep()
+    return len(collected) == len(multiworld.get_locations()) and \
+        all(condition(state) for condition in multiworld.completion_condition.values())
@@ -0,0 +1,339 @@
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from random import Random
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from harness import generate, get_option_combinations, place_randomly
+
+from worlds.dawnsbury.SlotData import decode_slot_data
+
+# Offline load test of the client protocol: a stand-in for archipelago's MultiServer, and a swarm of simulated mod clients.
+# Run from the Archipelago folder with: python tests/loadtest.py --slots 300 --output results.json
+# The server only handles the messages the mod uses (Connect/Connected, ReceivedItems, LocationChecks, Set/Get data storage,
+#  Bounce for deathlink and StatusUpdate), with archipelago's json packets. They're sent one json list per line over tcp instead of
+#  over websockets (which would need a dependency), so the numbers measure the protocol's handling, not archipelago's network stack.
+
+GAME_NAME = "Dawnsbury Days"
+CLIENT_GOAL = 30 # ClientStatus.CLIENT_GOAL
+ITEMS_HANDLING_ALL = 0b111 # Items from other worlds, our own world and our starting inventory (ItemsHandlingFlags.AllItems in the mod)
+LINE_LIMIT = 2 ** 20
+
+class SlotInfo(NamedTuple):
+    '''What the server knows about a slot (like the multidata archipelago's generation writes)'''
+    name: str
+    slot_data: Dict[str, Any]
+    locations: Dict[int, Tuple[int, int, int]] # Location id -> item id, receiving player and item flags
+
+def get_slot_name(player: int) -> str:
+    return f"Player{player}"
+
+def make_slot_infos(option_sets: List[dict], seed: int = 0) -> Dict[int, SlotInfo]:
+    '''Generate a multiworld (placing the items without logic, which doesn't matter here) and package what the server needs from it'''
+    multiworld = generate(*option_sets, seed=seed, fill=place_randomly)
+    slots = {}
+    for player, world in multiworld.worlds.items():
+        locations = {location.address: (location.item.code, location.item.player, int(location.item.classification))
+                     for location in multiworld.get_locations(player) if location.address is not None and location.item.code is not None}
+        slots[player] = SlotInfo(get_slot_name(player), world.fill_slot_data(), locations)
+    return slots
+
+def encode_packets(*packets: dict) -> bytes:
+    return (json.dumps(packets, separators=(',', ':')) + '\n').encode('utf-8')
+
+class ServerClient:
+    '''A connection to the stand-in server'''
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.slot: Optional[int] = None
+        self.tags: Set[str] = set()
+
+class StandInServer:
+    '''Stand-in for archipelago's MultiServer, handling only the messages the dawnsbury mod sends'''
+    def __init__(self, slots: Dict[int, SlotInfo]):
+        self.slots = slots
+        self.slot_names = {info.name: player for player, info in slots.items()}
+        self.checked: Dict[int, Set[int]] = {player: set() for player in slots}
+        self.received: Dict[int, List[dict]] = {player: [] for player in slots} # Items sent to each slot, in order
+        self.data_storage: Dict[str, Any] = {}
+        self.goals: Set[int] = set()
+        self.clients: Dict[int, List[ServerClient]] = {player: [] for player in slots}
+        self.deathlink_clients: Set[ServerClient] = set()
+        self.packets_received = 0
+        self.packets_sent = 0
+        self.bounces: List[Tuple[int, float]] = [] # Recipients and seconds spent sending each deathlink
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 0) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle_connection, host, port, limit=LINE_LIMIT, backlog=max(100, len(self.slots)))
+
+    def send(self, client: ServerClient, *packets: dict):
+        if not client.writer.is_closing(): # It might have left without the server reading its end of the connection yet
+            self.packets_sent += len(packets)
+            client.writer.write(encode_packets(*packets))
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        client = ServerClient(writer)
+        self.send(client, {'cmd': 'RoomInfo', 'version': {'major': 0, 'minor': 6, 'build': 3, 'class': 'Version'}, 'seed_name': 'loadtest'})
+        try:
+            while line := await reader.readline():
+                for packet in json.loads(line):
+                    self.packets_received += 1
+                    getattr(self, f"on_{packet['cmd']}")(client, packet)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if client.slot is not None:
+                self.clients[client.slot].remove(client)
+            self.deathlink_clients.discard(client)
+            writer.close()
+
+    def get_storage_key(self, client: ServerClient, key: str) -> str:
+        return f"{client.slot}:{key}" # Everything the mod stores is scoped to its slot
+
+    def on_Connect(self, client: ServerClient, packet: dict):
+        player = self.slot_names.get(packet['name'])
+        if player is None or packet['game'] != GAME_NAME:
+            self.send(client, {'cmd': 'ConnectionRefused', 'errors': ['InvalidSlot' if player is None else 'InvalidGame']})
+            return
+        client.slot, client.tags = player, set(packet.get('tags', ()))
+        self.clients[player].append(client)
+        if 'DeathLink' in client.tags:
+            self.deathlink_clients.add(client)
+
+        slot = self.slots[player]
+        connected = {'cmd': 'Connected', 'team': 0, 'slot': player, 'checked_locations': sorted(self.checked[player]),
+                     'missing_locations': sorted(slot.locations.keys() - self.checked[player])}
+        if packet.get('slot_data', True):
+            connected['slot_data'] = slot.slot_data
+        # Catch the client up on every item it was sent while it was away
+        if packet.get('items_handling', 0) and self.received[player]:
+            self.send(client, connected, {'cmd': 'ReceivedItems', 'index': 0, 'items': self.received[player]})
+        else:
+            self.send(client, connected)
+
+    def on_ConnectUpdate(self, client: ServerClient, packet: dict):
+        client.tags = set(packet['tags'])
+        if 'DeathLink' in client.tags:
+            self.deathlink_clients.add(client)
+        else:
+            self.deathlink_clients.discard(client)
+
+    def on_LocationChecks(self, client: ServerClient, packet: dict):
+        new_items: Dict[int, List[dict]] = {}
+        for location in packet['locations']:
+            if location in self.checked[client.slot] or location not in self.slots[client.slot].locations:
+                continue
+            self.checked[client.slot].add(location)
+            item, player, flags = self.slots[client.slot].locations[location]
+            new_items.setdefault(player, []).append({'item': item, 'location': location, 'player': client.slot, 'flags': flags})
+
+        for player, items in new_items.items():
+            index = len(self.received[player])
+            self.received[player] += items
+            for receiver in self.clients[player]:
+                self.send(receiver, {'cmd': 'ReceivedItems', 'index': index, 'items': items})
+
+    def on_Set(self, client: ServerClient, packet: dict):
+        key = self.get_storage_key(client, packet['key'])
+        original = self.data_storage.get(key, packet.get('default'))
+        value = original
+        for operation in packet['operations']:
+            if operation['operation'] == 'replace':
+                value = operation['value']
+            elif operation['operation'] == 'add':
+                value += operation['value']
+            elif operation['operation'] != 'default':
+                raise ValueError(f"Unsupported data storage operation {operation['operation']}.")
+        self.data_storage[key] = value
+        if packet.get('want_reply'):
+            self.send(client, {'cmd': 'SetReply', 'key': packet['key'], 'value': value, 'original_value': original})
+
+    def on_Get(self, client: ServerClient, packet: dict):
+        self.send(client, {'cmd': 'Retrieved', 'keys': {key: self.data_storage.get(self.get_storage_key(client, key)) for key in packet['keys']}})
+
+    def on_Bounce(self, client: ServerClient, packet: dict):
+        if 'DeathLink' not in packet.get('tags', ()):
+            return
+        start = time.perf_counter()
+        data = encode_packets({'cmd': 'Bounced', 'tags': packet['tags'], 'data': packet['data']})
+        receivers = [receiver for receiver in self.deathlink_clients if not receiver.writer.is_closing()]
+        for receiver in receivers:
+            receiver.writer.write(data)
+        self.packets_sent += len(receivers)
+        self.bounces.append((len(receivers), time.perf_counter() - start))
+
+    def on_StatusUpdate(self, client: ServerClient, packet: dict):
+        if packet['status'] == CLIENT_GOAL:
+            self.goals.add(client.slot)
+
+class SwarmClient:
+    '''A simulated dawnsbury mod, which replays its campaign against the server like ArchipelagoClient does'''
+    def __init__(self, player: int, host: str, port: int, rng: Random, loss_chance: float):
+        self.name = get_slot_name(player)
+        self.host, self.port = host, port
+        self.rng = rng
+        self.loss_chance = loss_chance
+        self.items: List[dict] = []
+        self.deathlinks_received = 0
+        self.catch_up_seconds: List[float] = []
+        self.catch_up_items: List[int] = []
+        self.out_of_order = 0
+
+    async def connect(self):
+        '''Connect and log in, then catch up on old items and load the saved progress (like InitializeRandomizer)'''
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port, limit=LINE_LIMIT)
+        self.replies: asyncio.Queue = asyncio.Queue()
+        self.listener = asyncio.create_task(self.listen())
+        await self.expect('RoomInfo')
+
+        self.items = [] # The server resends everything on connect, like archipelago does
+        start = time.perf_counter()
+        self.send({'cmd': 'Connect', 'game': GAME_NAME, 'name': self.name, 'password': '', 'uuid': self.name, 'slot_data': True,
+                   'version': {'major': 0, 'minor': 6, 'build': 3, 'class': 'Version'}, 'items_handling': ITEMS_HANDLING_ALL, 'tags': []})
+        connected = await self.expect('Connected')
+        self.catch_up_seconds.append(time.perf_counter() - start)
+        self.catch_up_items.append(len(self.items))
+
+        self.slot_data = decode_slot_data(connected['slot_data'])
+        self.deathlink = bool(self.slot_data['deathlink'])
+        if self.deathlink: # The deathlink service adds its tag once the slot data says to
+            self.send({'cmd': 'ConnectUpdate', 'tags': ['DeathLink']})
+        self.send({'cmd': 'Set', 'key': 'encounters_cleared', 'default': 0, 'want_reply': False, 'operations': [{'operation': 'default', 'value': None}]},
+                  {'cmd': 'Set', 'key': 'inventory_items_saved', 'default': 0, 'want_reply': False, 'operations': [{'operation': 'default', 'value': None}]},
+                  {'cmd': 'Get', 'keys': ['encounters_cleared', 'inventory_items_saved']})
+        saved = (await self.expect('Retrieved'))['keys']
+        return saved['encounters_cleared'], connected
+
+    async def disconnect(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        self.listener.cancel()
+
+    def send(self, *packets: dict):
+        self.writer.write(encode_packets(*packets))
+
+    async def expect(self, cmd: str) -> dict:
+        packet = await self.replies.get()
+        if packet['cmd'] != cmd:
+            raise RuntimeError(f"{self.name} expected {cmd} from the server, but got {packet['cmd']}.")
+        return packet
+
+    async def listen(self):
+        while line := await self.reader.readline():
+            for packet in json.loads(line):
+                if packet['cmd'] == 'ReceivedItems':
+                    if packet['index'] != len(self.items):
+                        self.out_of_order += 1 # The mod would have to resync here
+                    self.items[packet['index']:] = packet['items']
+                elif packet['cmd'] == 'Bounced':
+                    if packet['data']['source'] != self.name:
+                        self.deathlinks_received += 1
+                else:
+                    self.replies.put_nowait(packet)
+
+    async def play(self, finish: Callable[[], Awaitable], reconnect_at: float = 0.5):
+        '''Clear every encounter in order, reconnecting part way through to catch up on the items sent while away.
+           Stays connected until the whole swarm is finished (awaiting finish), so it gets every item sent to it.'''
+        cleared, connected = await self.connect()
+        encounters, base_offset = self.slot_data['num_encounters'], self.slot_data['base_offset']
+        reconnected = False
+        while cleared < encounters:
+            if not reconnected and cleared >= encounters * reconnect_at:
+                await self.disconnect()
+                cleared, connected = await self.connect()
+                reconnected = True
+                continue
+
+            if self.rng.random() < self.loss_chance and self.deathlink:
+                self.send({'cmd': 'Bounce', 'tags': ['DeathLink'],
+                           'data': {'time': time.time(), 'source': self.name, 'cause': f"{self.name} lost a battle"}})
+            # SendNextEncounterLocation: save the progress, then check the encounter's location
+            self.send({'cmd': 'Set', 'key': 'encounters_cleared', 'default': 0, 'want_reply': False,
+                       'operations': [{'operation': 'replace', 'value': cleared + 1}]},
+                      {'cmd': 'LocationChecks', 'locations': [base_offset + cleared]})
+            cleared += 1
+            if self.rng.random() < 0.25:
+                self.send({'cmd': 'Set', 'key': 'inventory_items_saved', 'default': 0, 'want_reply': False,
+                           'operations': [{'operation': 'replace', 'value': len(self.items)}]})
+            await self.writer.drain()
+            await asyncio.sleep(0) # Let the rest of the swarm play too
+
+        self.send({'cmd': 'StatusUpdate', 'status': CLIENT_GOAL})
+        await self.round_trip()
+        await finish()
+        await self.round_trip()
+        await self.disconnect()
+
+    async def round_trip(self):
+        '''Wait for the server to handle everything sent before this (and to send everything it had for us)'''
+        self.send({'cmd': 'Get', 'keys': ['encounters_cleared']})
+        await self.expect('Retrieved')
+
+def summarize_seconds(values: List[float]) -> Dict[str, float]:
+    values = sorted(values)
+    return {'mean_ms': round(1000 * statistics.fmean(values), 3), 'p50_ms': round(1000 * values[len(values) // 2], 3),
+            'p95_ms': round(1000 * values[int(len(values) * 0.95)], 3), 'max_ms': round(1000 * values[-1], 3)}
+
+async def run_swarm(slots: Dict[int, SlotInfo], seed: int = 0, loss_chance: float = 0.1) -> Tuple[dict, StandInServer, List[SwarmClient]]:
+    '''Serve the slots and have a simulated client play each one at the same time, returning the results'''
+    server = StandInServer(slots)
+    tcp_server = await server.serve()
+    host, port = tcp_server.sockets[0].getsockname()[:2]
+    clients = [SwarmClient(player, host, port, Random(seed * 100003 + player), loss_chance) for player in slots]
+
+    remaining, everyone_finished = len(clients), asyncio.Event()
+    async def finish():
+        nonlocal remaining
+        remaining -= 1
+        if not remaining:
+            everyone_finished.set()
+        await everyone_finished.wait()
+
+    start = time.perf_counter()
+    async with tcp_server:
+        await asyncio.gather(*(client.play(finish) for client in clients))
+    seconds = time.perf_counter() - start
+
+    bounce_recipients = sum(recipients for recipients, _ in server.bounces)
+    results = {
+        'slots': len(slots),
+        'seconds': round(seconds, 6),
+        'packets_received': server.packets_received,
+        'packets_sent': server.packets_sent,
+        'messages_per_second': round((server.packets_received + server.packets_sent) / seconds),
+        'catch_up': {'connects': sum(len(client.catch_up_seconds) for client in clients),
+                     'mean_items': round(statistics.fmean(items for client in clients for items in client.catch_up_items), 3),
+                     **summarize_seconds([latency for client in clients for latency in client.catch_up_seconds])},
+        'deathlink': {'bounces': len(server.bounces), 'recipients': bounce_recipients,
+                      'fan_out_ms_per_bounce': round(1000 * sum(seconds for _, seconds in server.bounces) / max(1, len(server.bounces)), 6),
+                      'fan_out_us_per_recipient': round(1e6 * sum(seconds for _, seconds in server.bounces) / max(1, bounce_recipients), 6)},
+        'errors': {'missing_goals': len(slots) - len(server.goals),
+                   'missing_items': sum(len(server.received[client_player]) != len(client.items)
+                                        for client_player, client in zip(slots, clients)),
+                   'out_of_order_items': sum(client.out_of_order for client in clients)},
+    }
+    return results, server, clients
+
+def make_option_sets(slots: int) -> List[dict]:
+    '''Cycle through the option combinations, with deathlink on for every other slot'''
+    combinations = get_option_combinations()
+    return [{**combinations[i % len(combinations)], 'deathlink': i % 2} for i in range(slots)]
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Load test the client protocol with a swarm of simulated dawnsbury clients.")
+    parser.add_argument('--slots', type=int, default=300, help='Number of dawnsbury slots (and simulated clients)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the generation and the clients')
+    parser.add_argument('--loss-chance', type=float, default=0.1, help='Chance of losing (and sending a deathlink) before each encounter')
+    parser.add_argument('--output', default=None, help='Save the results to this json file instead of printing them')
+    args = parser.parse_args()
+
+    slot_infos = make_slot_infos(make_option_sets(args.slots), args.seed)
+    results = asyncio.run(run_swarm(slot_infos, args.seed, args.loss_chance))[0]
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
@@ -0,0 +1,137 @@
+from collections import Counter
+from enum import IntFlag
+from random import Random
+from typing import Dict, List
+
+# Stand-ins for the parts of archipelago's BaseClasses that the world uses (for offline tests and the build's import timing only).
+
+class ItemClassification(IntFlag):
+    filler = 0
+    progression = 1
+    useful = 2
+    trap = 4
+
+class Item:
+    game = "Generic"
+
+    def __init__(self, name: str, classification: ItemClassification, code: int, player: int):
+        self.name = name
+        self.classification = classification
+        self.code = code
+        self.player = player
+        self.location = None
+
+    @property
+    def advancement(self) -> bool:
+        return bool(self.classification & ItemClassification.progression)
+
+class Location:
+    game = "Generic"
+    item = None
+    locked = False
+
+    def __init__(self, player: int, name: str = '', address: int = None, parent: 'Region' = None):
+        self.player = player
+        self.name = name
+        self.address = address
+        self.parent_region = parent
+        self.access_rule = lambda state: True
+
+    def can_reach(self, state: 'CollectionState') -> bool:
+        return self.parent_region.can_reach(state) and self.access_rule(state)
+
+    def place_locked_item(self, item: Item):
+        self.item = item
+        item.location = self
+        self.locked = True
+
+class Region:
+    def __init__(self, name: str, player: int, multiworld: 'MultiWorld'):
+        self.name = name
+        self.player = player
+        self.multiworld = multiworld
+        self.locations: List[Location] = []
+        self.exits: List[Entrance] = []
+
+    def can_reach(self, state: 'CollectionState') -> bool:
+        return self in state.reachable_regions(self.player)
+
+class Entrance:
+    def __init__(self, player: int, name: str = '', parent: Region = None):
+        self.player = player
+        self.name = name
+        self.parent_region = parent
+        self.connected_region = None
+        self.access_rule = lambda state: True
+
+    def connect(self, region: Region):
+        self.connected_region = region
+
+class CollectionState:
+    def __init__(self, multiworld: 'MultiWorld'):
+        self.multiworld = multiworld
+        self.prog_items: Dict[int, Counter] = {player: Counter() for player in multiworld.player_ids}
+
+    def reachable_regions(self, player: int) -> List[Region]:
+        '''Walk the regions from the menu (not cached, since the rules are cheap and the worlds are small)'''
+        reached = [self.multiworld.get_region('Menu', player)]
+        for region in reached:
+            for exit in region.exits:
+                if exit.connected_region not in reached and exit.access_rule(self):
+                    reached.append(exit.connected_region)
+        return reached
+
+    def has(self, item: str, player: int, count: int = 1) -> bool:
+        return self.prog_items[player][item] >= count
+
+    def collect(self, item: Item) -> bool:
+        return self.multiworld.worlds[item.player].collect(self, item)
+
+    def remove(self, item: Item) -> bool:
+        return self.multiworld.worlds[item.player].remove(self, item)
+
+    def sweep(self, collected: set = None) -> set:
+        '''Collect the item of every reachable filled location, until there are no more. Returns the locations collected.'''
+        collected = set() if collected is None else collected
+        found = True
+        while found:
+            found = False
+            for location in self.multiworld.get_locations():
+                if location.item is not None and location not in collected and location.can_reach(self):
+                    collected.add(location)
+                    self.collect(location.item)
+                    found = True
+        return collected
+
+class MultiWorld:
+    def __init__(self, players: int, seed: int = 0):
+        self.player_ids = range(1, players + 1)
+        self.random = Random(seed)
+        self.worlds = {}
+        self.regions: List[Region] = []
+        self.itempool: List[Item] = []
+        self.completion_condition = {}
+        self._player_regions = {}
+        self._indexed_regions = 0
+
+    def get_game_worlds(self, game: str) -> list:
+        return [world for world in self.worlds.values() if world.game == game]
+
+    def get_player_regions(self, player: int) -> List[Region]:
+        '''Get a player's regions, indexed by player like archipelago's region manager (so big multiworlds don't scan every region)'''
+        if self._indexed_regions != len(self.regions):
+            self._player_regions = {}
+            for region in self.regions:
+                self._player_regions.setdefault(region.player, []).append(region)
+            self._indexed_regions = len(self.regions)
+        return self._player_regions.get(player, [])
+
+    def get_region(self, name: str, player: int) -> Region:
+        return next(region for region in self.get_player_regions(player) if region.name == name)
+
+    def get_locations(self, player: int = None) -> List[Location]:
+        regions = self.regions if player is None else self.get_player_regions(player)
+        return [location for region in regions for location in region.locations]
+
+    def get_location(self, name: str, player: int) -> Location:
+        return next(location for location in self.get_locations(player) if location.name == name)
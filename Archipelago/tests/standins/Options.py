@@ -0,0 +1,180 @@
+import random
+import typing
+from dataclasses import dataclass
+from enum import IntFlag
+
+# Stand-ins for the option types that the world uses (for offline tests and the build's import timing only).
+
+class Visibility(IntFlag):
+    none = 0
+    template = 1
+    simple_ui = 2
+    complex_ui = 4
+    spoiler = 8
+    all = 15
+
+class Option:
+    default = 0
+    visibility = Visibility.all
+    supports_weighting = True
+
+    def __init__(self, value):
+        self.value = value
+
+    def __bool__(self) -> bool:
+        return bool(self.value)
+
+    @property
+    def current_key(self) -> str:
+        return str(self.value)
+
+    @classmethod
+    def from_any(cls, data) -> 'Option':
+        if isinstance(data, cls):
+            return data
+        if isinstance(data, int):
+            return cls(int(data))
+        return cls.from_text(str(data))
+
+class Choice(Option):
+    options: typing.Dict[str, int]
+    name_lookup: typing.Dict[int, str]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.options = {name[7:].lower(): value for name, value in vars(cls).items() if name.startswith('option_')}
+        cls.name_lookup = {value: name for name, value in cls.options.items()}
+
+    @classmethod
+    def from_text(cls, text: str) -> 'Choice':
+        if text.lower() == 'random':
+            return cls(random.choice(list(cls.options.values())))
+        return cls(cls.options[text.lower()])
+
+    @property
+    def current_key(self) -> str:
+        return self.name_lookup[self.value]
+
+class Toggle(Choice):
+    option_false = 0
+    option_true = 1
+
+    @classmethod
+    def from_text(cls, text: str) -> 'Toggle':
+        if text == 'random':
+            return cls(random.choice((0, 1)))
+        return cls(0 if text.lower() in {'off', '0', 'false', 'none', 'null', 'no'} else 1)
+
+class DefaultOnToggle(Toggle):
+    default = 1
+
+class FreeText(Option):
+    default = ''
+
+    @classmethod
+    def from_text(cls, text: str) -> 'FreeText':
+        return cls(text)
+
+    @classmethod
+    def from_any(cls, data) -> 'FreeText':
+        return data if isinstance(data, cls) else cls(str(data))
+
+class Range(Option):
+    range_start = 0
+    range_end = 1
+
+    @classmethod
+    def from_text(cls, text: str) -> 'Range':
+        if text.lower().startswith('random'):
+            return cls(random.randint(cls.range_start, cls.range_end))
+        return cls(int(text))
+
+class NamedRange(Range):
+    special_range_names: typing.Dict[str, int] = {}
+
+    @classmethod
+    def from_text(cls, text: str) -> 'NamedRange':
+        if text.lower() in cls.special_range_names:
+            return cls(cls.special_range_names[text.lower()])
+        return super().from_text(text)
+
+class OptionCollection(Option):
+    '''Options which take their value as is (a list, set or dict), so they can't be weighted'''
+    supports_weighting = False
+    value_type: type = list
+
+    @classmethod
+    def from_any(cls, data) -> 'OptionCollection':
+        if isinstance(data, cls):
+            return data
+        if not isinstance(data, (list, tuple, set, frozenset, dict)):
+            raise ValueError(f"{cls.__name__} needs a collection, not {data!r}.")
+        return cls(cls.value_type(data))
+
+class OptionList(OptionCollection):
+    default = ()
+
+class OptionSet(OptionCollection):
+    default = frozenset()
+    value_type = set
+
+class OptionDict(OptionCollection):
+    default = {}
+    value_type = dict
+
+# The options every game has
+class ProgressionBalancing(NamedRange):
+    default = 50
+    range_start = 0
+    range_end = 99
+    special_range_names = {'disabled': 0, 'normal': 50, 'extreme': 99}
+
+class Accessibility(Choice):
+    option_full = 0
+    option_minimal = 2
+
+class LocalItems(OptionSet):
+    pass
+
+class NonLocalItems(OptionSet):
+    pass
+
+class StartInventory(OptionDict):
+    pass
+
+class StartHints(OptionSet):
+    pass
+
+class StartLocationHints(OptionSet):
+    pass
+
+class ExcludeLocations(OptionSet):
+    pass
+
+class PriorityLocations(OptionSet):
+    pass
+
+class ItemLinks(OptionList):
+    pass
+
+class PlandoItems(OptionList):
+    pass
+
+class OptionsMetaProperty(type):
+    @property
+    def type_hints(cls) -> typing.Dict[str, type]:
+        return typing.get_type_hints(cls)
+
+@dataclass
+class PerGameCommonOptions(metaclass=OptionsMetaProperty):
+    progression_balancing: ProgressionBalancing
+    accessibility: Accessibility
+    local_items: LocalItems
+    non_local_items: NonLocalItems
+    start_inventory: StartInventory
+    start_hints: StartHints
+    start_location_hints: StartLocationHints
+    exclude_locations: ExcludeLocations
+    priority_locations: PriorityLocations
+    item_links: ItemLinks
+    plando_items: PlandoItems
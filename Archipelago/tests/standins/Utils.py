@@ -0,0 +1,6 @@
+import yaml
+
+# Stand-in for archipelago's yaml parsing (for offline tests only).
+
+def parse_yamls(text: str):
+    return yaml.safe_load_all(text)
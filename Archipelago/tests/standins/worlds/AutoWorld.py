@@ -0,0 +1,41 @@
+from random import Random
+
+# Stand-in for archipelago's World (for offline tests and the build's import timing only).
+
+class World:
+    game: str = "Generic"
+    item_name_groups = {}
+    location_name_groups = {}
+
+    def __init__(self, multiworld, player: int):
+        self.multiworld = multiworld
+        self.player = player
+        self.random = Random(multiworld.random.getrandbits(64))
+
+    def collect_item(self, state, item, remove: bool = False) -> str:
+        return item.name if item.advancement else None
+
+    def collect(self, state, item) -> bool:
+        name = self.collect_item(state, item)
+        if name:
+            state.prog_items[item.player][name] += 1
+            return True
+        return False
+
+    def remove(self, state, item) -> bool:
+        name = self.collect_item(state, item, True)
+        if name:
+            state.prog_items[item.player][name] -= 1
+            return True
+        return False
+
+def call_all(multiworld, method_name: str, *args):
+    '''Run a generation step on every world, then its stage method on each world class (like archipelago does)'''
+    for world in multiworld.worlds.values():
+        method = getattr(world, method_name, None)
+        if method:
+            method(*args)
+    for world_type in {type(world) for world in multiworld.worlds.values()}:
+        stage = getattr(world_type, f'stage_{method_name}', None)
+        if stage:
+            stage(multiworld, *args)
@@ -0,0 +1 @@
+# Stand-in for archipelago's worlds package. The dawnsbury world gets loaded into it as worlds.dawnsbury.
@@ -0,0 +1,93 @@
+import unittest
+
+from harness import create_multiworld, dawnsbury, generate, get_option_combinations, is_beatable
+
+from worlds.dawnsbury.CampaignData import get_chosen_campaign
+from worlds.dawnsbury.IdTable import decode_item_id, get_id_table
+from worlds.dawnsbury.SlotData import SLOT_DATA_BUDGET, decode_slot_data, get_slot_data_size
+
+class TestGeneration(unittest.TestCase):
+    def test_every_campaign_and_option_combination(self):
+        for options in get_option_combinations():
+            with self.subTest(**options):
+                multiworld = generate(options)
+                world = multiworld.worlds[1]
+                campaign = get_chosen_campaign(world.options)
+
+                locations = multiworld.get_locations(1)
+                self.assertEqual(len(locations), campaign.num_encounters)
+                self.assertTrue(all(location.item is not None for location in locations))
+                self.assertTrue(is_beatable(multiworld))
+
+                slot_data = decode_slot_data(world.fill_slot_data())
+                self.assertEqual(slot_data['num_encounters'], campaign.num_encounters)
+                self.assertEqual(len(slot_data['encounter_loot']), campaign.num_encounters if options['loot_randomizer'] else 0)
+                self.assertEqual(len(slot_data['encounter_rewards']), 3 * campaign.num_encounters if options['scout_rewards'] else 0)
+
+    def test_level_gating_fills(self):
+        # The fill never swaps, so every one of these has to work on the first try
+        for campaign in range(len(dawnsbury.CampaignData.All_Campaigns)):
+            for players in (1, 3):
+                with self.subTest(campaign=campaign, players=players):
+                    for seed in range(20):
+                        self.assertTrue(is_beatable(generate(*[{'campaign': campaign, 'level_gating': 1}] * players, seed=seed)))
+
+    def test_level_gating_regions(self):
+        for campaign in dawnsbury.CampaignData.All_Campaigns:
+            with self.subTest(campaign=campaign.name):
+                multiworld = generate({'campaign': dawnsbury.CampaignData.All_Campaigns.index(campaign), 'level_gating': 1})
+                regions = [region for region in multiworld.regions if region.name != 'Menu']
+                self.assertEqual(len(regions), len(campaign.levels))
+                self.assertEqual(sorted(location.name for region in regions for location in region.locations),
+                                 sorted(dawnsbury.IdTable.get_encounter_name(i + 1) for i in range(campaign.num_encounters)))
+
+    def test_multiworld(self):
+        options = get_option_combinations()
+        multiworld = generate(*options[::len(options) // 4], seed=1)
+        self.assertTrue(is_beatable(multiworld))
+        self.assertTrue(any(location.item.player != location.player for location in multiworld.get_locations()))
+
+    def test_same_seed_same_placement(self):
+        placements = [[(location.name, location.item.name) for location in generate({'campaign': 2}, {'campaign': 1}, seed=5).get_locations()]
+                      for _ in range(2)]
+        self.assertEqual(placements[0], placements[1])
+
+class TestSlotGroups(unittest.TestCase):
+    def test_same_options_share_a_group(self):
+        multiworld = generate({'campaign': 1}, {'campaign': 0}, {'campaign': 1}, {'campaign': 1, 'rng_seed': 'abc'})
+        groups = [world.slot_group for world in multiworld.worlds.values()]
+        self.assertIs(groups[0], groups[2])
+        self.assertEqual(len({id(group) for group in groups}), 3)
+
+    def test_without_the_stage_hook(self):
+        # Worlds generated on their own (without the stage methods) make their group data when they first need it
+        multiworld = create_multiworld({'campaign': 1, 'level_gating': 1})
+        world = multiworld.worlds[1]
+        world.create_regions()
+        world.create_items()
+        self.assertIsNotNone(world.slot_group)
+        self.assertEqual(len(multiworld.itempool), len(multiworld.get_locations(1)) - 1)
+        self.assertEqual(decode_slot_data(world.fill_slot_data())['campaign'], 1)
+
+class TestSlotData(unittest.TestCase):
+    def test_every_option_combination_is_within_budget(self):
+        # The loot and rewards change with the seed, so try a few of them
+        for options in get_option_combinations():
+            with self.subTest(**options):
+                for seed in range(3):
+                    size = get_slot_data_size(generate(options, seed=seed).worlds[1].fill_slot_data())
+                    self.assertLessEqual(size, SLOT_DATA_BUDGET)
+
+class TestIds(unittest.TestCase):
+    def test_item_ids_decode_to_their_names(self):
+        for name, code in dawnsbury.DawnsburyWorld.item_name_to_id.items():
+            item, character = decode_item_id(code)
+            self.assertEqual(name, dawnsbury.IdTable.make_character_item_name(item, character) if character else item)
+
+    def test_id_table_matches_world(self):
+        table = get_id_table()
+        self.assertEqual(list(dawnsbury.DawnsburyWorld.item_name_to_id), table['items'])
+        self.assertEqual(list(dawnsbury.DawnsburyWorld.location_name_to_id), table['locations'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from random import Random
+
+from harness import make_options
+
+from worlds.dawnsbury.Items import PoolTemplate, get_pool_template, trim_item_list
+
+def get_oversized_template(extra: int) -> PoolTemplate:
+    '''The profane barrier's pool (which really does need trimming), with a chosen number of items to trim'''
+    return get_pool_template(make_options(campaign=1))._replace(extra=extra)
+
+def trim(seed: int, extra: int = 6) -> list:
+    return list(trim_item_list(get_oversized_template(extra), Random(seed)))
+
+class TestTrim(unittest.TestCase):
+    def test_profane_barrier_needs_trimming(self):
+        template = get_pool_template(make_options(campaign=1))
+        self.assertGreater(template.extra, 0)
+        self.assertEqual(len(trim_item_list(template, Random(0))), len(template.names) - template.extra)
+
+    def test_same_seed_same_pool(self):
+        for seed in range(10):
+            self.assertEqual(trim(seed), trim(seed))
+        self.assertGreater(len({tuple(trim(seed)) for seed in range(10)}), 1)
+
+    def test_same_seed_same_pool_in_worker_processes(self):
+        seeds = range(8)
+        with ProcessPoolExecutor(2) as pool:
+            self.assertEqual(list(pool.map(trim, seeds)), [trim(seed) for seed in seeds])
+
+    def test_trims_lowest_priority_items_first(self):
+        template = get_oversized_template(6)
+        removed = Counter(template.names) - Counter(trim(0))
+        self.assertEqual(sum(count for name, count in removed.items() if name.startswith('Skill Upgrade')), 4)
+        self.assertEqual(sum(count for name, count in removed.items() if name.startswith('Armor Upgrade')), 2)
+
+    def test_too_many_extra_items(self):
+        template = get_oversized_template(0)
+        with self.assertRaises(ValueError):
+            trim_item_list(template._replace(extra=len(template.names) + 1), Random(0))
+
+if __name__ == '__main__':
+    unittest.main()
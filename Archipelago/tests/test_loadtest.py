@@ -0,0 +1,31 @@
+import asyncio
+import unittest
+
+from loadtest import make_option_sets, make_slot_infos, run_swarm
+
+from worlds.dawnsbury.SlotData import decode_slot_data
+
+class TestSwarm(unittest.TestCase):
+    def test_swarm_replays_every_slot(self):
+        slots = make_slot_infos(make_option_sets(8), seed=3)
+        results, server, clients = asyncio.run(run_swarm(slots, seed=3, loss_chance=0.3))
+
+        self.assertEqual(results['errors'], {'missing_goals': 0, 'missing_items': 0, 'out_of_order_items': 0})
+        for player, slot in slots.items():
+            self.assertEqual(server.checked[player], set(slot.locations))
+            self.assertEqual(server.data_storage[f'{player}:encounters_cleared'], decode_slot_data(slot.slot_data)['num_encounters'])
+        # Every slot reconnects part way through, and catches up on what it was sent
+        self.assertEqual(results['catch_up']['connects'], 2 * len(slots))
+        self.assertGreater(results['catch_up']['mean_items'], 0)
+
+    def test_deathlink_only_reaches_deathlink_slots(self):
+        slots = make_slot_infos(make_option_sets(6))
+        results, server, clients = asyncio.run(run_swarm(slots, loss_chance=1.0))
+
+        self.assertGreater(results['deathlink']['bounces'], 0)
+        for client in clients:
+            self.assertEqual(client.deathlinks_received > 0, client.deathlink)
+        self.assertFalse(any(client.deathlink for client in clients if client.name in ('Player1', 'Player3', 'Player5')))
+
+if __name__ == '__main__':
+    unittest.main()
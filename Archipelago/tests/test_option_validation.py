@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from harness import TESTS_DIR
+
+from worlds.dawnsbury import OptionValidation
+from worlds.dawnsbury.OptionValidation import get_dawnsbury_blocks, validate_option_weights, validate_yaml_directory
+
+TEMPLATE_PATH = os.path.join(TESTS_DIR, '..', 'Dawnsbury Days Template.yaml')
+
+class TestOptionWeights(unittest.TestCase):
+    def assertOneError(self, weights: dict, text: str):
+        errors = validate_option_weights(weights)
+        self.assertEqual(len(errors), 1, errors)
+        self.assertIn(text, errors[0])
+
+    def test_clean_weights(self):
+        self.assertEqual(validate_option_weights({'campaign': {'dawnsbury_days': 50, 'profane_barrier': 10},
+                                                  'level_gating': 'true', 'loot_randomizer': {'false': 50, 'true': 0}}), [])
+
+    def test_hidden_option_with_weight(self):
+        self.assertOneError({'loot_randomizer': {'false': 50, 'true': 1}}, "hidden option can't be set to 'true'")
+
+    def test_hidden_option_random(self):
+        self.assertOneError({'scout_rewards': 'random'}, "hidden option can't be randomized")
+        self.assertOneError({'include_free_encounters': {'random-high': 5}}, "hidden option can't be randomized")
+
+    def test_unknown_option(self):
+        self.assertOneError({'level_gatting': 'true'}, "not a Dawnsbury Days option")
+
+    def test_all_weights_zero(self):
+        self.assertOneError({'campaign': {'dawnsbury_days': 0, 'profane_barrier': 0}}, "every weight is 0")
+
+    def test_invalid_weights_and_values(self):
+        self.assertOneError({'campaign': {'dawnsbury_days': -1}}, "weights must be whole numbers")
+        self.assertOneError({'campaign': 'third_campaign'}, "not a valid value")
+
+class TestYamlFiles(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_template_is_clean(self):
+        blocks, errors = get_dawnsbury_blocks(TEMPLATE_PATH)
+        self.assertEqual(errors, [])
+        self.assertEqual(len(blocks), 1)
+        self.assertEqual(validate_option_weights(blocks[0]), [])
+
+    def test_identical_blocks_validated_once(self):
+        for name in ('Player1.yaml', 'Player2.yaml', 'Player3.yml'):
+            shutil.copy(TEMPLATE_PATH, os.path.join(self.directory, name))
+        with open(os.path.join(self.directory, 'Player4.yaml'), 'w', encoding='utf-8') as file:
+            file.write("name: Player4\ngame: Dawnsbury Days\nDawnsbury Days:\n  scout_rewards: 'true'\n")
+
+        # Threads instead of processes, so the calls can be counted
+        validate = mock.Mock(wraps=validate_option_weights)
+        with mock.patch.object(OptionValidation, 'ProcessPoolExecutor', ThreadPoolExecutor), \
+                mock.patch.object(OptionValidation, 'validate_option_weights', validate):
+            report = validate_yaml_directory(self.directory)
+
+        self.assertEqual(validate.call_count, 2)
+        self.assertEqual({name: len(errors) for name, errors in report.items()},
+                         {os.path.join(self.directory, name): count for name, count in
+                          (('Player1.yaml', 0), ('Player2.yaml', 0), ('Player3.yml', 0), ('Player4.yaml', 1))})
+
+    def test_unparseable_file(self):
+        path = os.path.join(self.directory, 'Broken.yaml')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write("name: [Broken\n")
+        self.assertIn("could not be parsed", validate_yaml_directory(self.directory)[path][0])
+
+if __name__ == '__main__':
+    unittest.main()
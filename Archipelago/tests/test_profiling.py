@@ -0,0 +1,36 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import harness # Loads the world
+
+from worlds.dawnsbury import Profiling
+
+class TestProfileReports(unittest.TestCase):
+    def setUp(self):
+        self.output_directory = tempfile.mkdtemp()
+        stats = {'calls': 0, 'seconds': 0.0}
+        patches = (mock.patch.dict(Profiling._dd_profile, {'Test.generate': stats}, clear=True),
+                   mock.patch.object(Profiling, 'profiling_setting', '1'))
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.stats = stats
+
+    def run_generation(self, key: int, calls: int) -> dict:
+        '''Pretend a generation with one slot made some calls, and return its report'''
+        self.stats['calls'] += calls
+        self.stats['seconds'] += calls * 0.5
+        self.assertIsNone(Profiling.write_profile_report_when_done(key, 1, filled_slot=1))
+        path = Profiling.write_profile_report_when_done(key, 1, output_directory=self.output_directory)
+        self.assertEqual(path, os.path.join(self.output_directory, Profiling.PROFILE_REPORT_FILE))
+        with open(path, encoding='utf-8') as file:
+            return json.load(file)['functions']['Test.generate']
+
+    def test_each_generation_reports_only_its_own_calls(self):
+        self.assertEqual(self.run_generation(1, 3)['calls'], 3)
+        second = self.run_generation(2, 2)
+        self.assertEqual(second['calls'], 2)
+        self.assertEqual(second['seconds'], 1.0)
@@ -32,6 +32,11 @@ public class ArchipelagoClient(ApConnectionInfo connection)
 
     private const int PROTOCOL_VERSION = 10300; // 1.03.00
 
+    // Checksum of the apworld's id table (the base offset, and every item and location name in id order).
+    // Our item and location ids are worked out from the base offset, so this is how we know that they match the apworld's.
+    // The apworld build script fails if this doesn't match the apworld's id table.
+    private const string ID_TABLE_CHECKSUM = "6370cf8d76865c79";
+
     // Enum defining the item types we get from the server
     public enum ApItemTypes
     {
@@ -148,6 +153,11 @@ public class ArchipelagoClient(ApConnectionInfo connection)
         // Archipelago requires unique keys across all games, so we solve this by defining a base offset for items/locations
         apBaseIDOffset = Convert.ToInt64(slotData["base_offset"]);
 
+        // Check that the apworld numbers its items and locations the same way we do (older apworlds don't send a checksum)
+        string idChecksum = Convert.ToString(slotData.GetValueOrDefault("id_checksum")) ?? "";
+        if (idChecksum != "" && idChecksum != ID_TABLE_CHECKSUM)
+            ApMessages.LogError($"Archipelago Id Mismatch: Your Archipelago World and Game Mod number items and locations differently; items and checks will not work correctly.");
+
         // get the custom rng seed, or default to the archipelago server's seed
         RngSeed = Convert.ToString(slotData["rng_seed"]) ?? apSession.RoomState.Seed;
         if (RngSeed == "") RngSeed = apSession.RoomState.Seed;